@@ -1,40 +1,203 @@
 """浏览器单例管理器
 
-全局管理单个 Chromium 浏览器实例，确保线程安全。
+全局管理 Chromium 浏览器实例池，按启动配置复用浏览器进程，确保线程安全。
 """
 
+import asyncio
+import atexit
+import functools
+import inspect
 import logging
+import os
 import threading
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 from DrissionPage import Chromium, ChromiumOptions
 
 logger = logging.getLogger(__name__)
 
 
+def _enable_http_keepalive() -> None:
+    """让 DrissionPage 查询 /json 接口时复用 HTTP 连接（需设置 DP_MCP_HTTP_KEEPALIVE=1）
+    
+    CDP 命令走常驻的 WebSocket 连接，但标签页列表（get_tabs、latest_tab 等）
+    每次都通过新建的 HTTP 连接请求 /json，并带有 Connection: close。这里替换为
+    共享的 keep-alive 会话。替换的是 DrissionPage 的私有实现，会影响进程内的所有
+    DrissionPage 使用方，因此默认关闭，且只在其签名与预期一致时替换。
+    
+    由 BrowserManager 首次创建时调用，重复调用不会重复替换。
+    """
+    if os.environ.get("DP_MCP_HTTP_KEEPALIVE", "0") != "1":
+        return
+    try:
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+        from requests.exceptions import ConnectionError, Timeout
+        from DrissionPage._base.driver import BrowserDriver
+    except ImportError:
+        return
+    
+    original = inspect.getattr_static(BrowserDriver, "get", None)
+    if getattr(original, "_dp_mcp_keepalive", False):
+        return
+    if not isinstance(original, staticmethod) or list(
+        inspect.signature(original.__func__).parameters
+    ) != ["url"]:
+        logger.warning("DrissionPage 的 BrowserDriver.get 与预期不符，不启用 HTTP keep-alive")
+        return
+    
+    original_get = original.__func__
+    session = Session()
+    session.trust_env = False
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+    
+    def get(url):
+        try:
+            return session.get(url, timeout=10)
+        except Timeout:
+            # 浏览器无响应时直接报错，不再用新连接重试而让等待时间翻倍
+            raise
+        except ConnectionError as e:
+            # 复用的连接已被浏览器关闭，改用新连接重试一次
+            logger.debug("keep-alive 连接失效，回退到新连接: %s", e)
+            return original_get(url)
+    
+    patched = staticmethod(get)
+    patched._dp_mcp_keepalive = True
+    BrowserDriver.get = patched
+
+
+# 浏览器池最多保留的实例数，超出时关闭最久未使用的实例
+_POOL_MAX_SIZE = 3
+
+# 浏览器空闲超时（毫秒），超时未使用的非当前实例会被自动关闭；默认 0，不自动关闭
+_IDLE_TIMEOUT_MS = int(os.environ.get("DP_MCP_BROWSER_IDLE_TIMEOUT_MS", 0))
+
+# 调用方显式指定端口或用户数据目录的配置项，此时不再自动分配
+_PORT_OPTIONS = frozenset({"set_local_port", "set_address", "auto_port", "set_user_data_path"})
+
+# init_browser 可通过 **kwargs 转发的 ChromiumOptions 方法白名单：参数名 -> 方法名
+_OPTION_SETTERS: Dict[str, str] = {
+    "set_argument": "set_argument",
+    "remove_argument": "remove_argument",
+    "set_user_agent": "set_user_agent",
+    "set_proxy": "set_proxy",
+    "set_load_mode": "set_load_mode",
+    "set_browser_path": "set_browser_path",
+    "set_user_data_path": "set_user_data_path",
+    "set_user": "set_user",
+    "set_local_port": "set_local_port",
+    "set_address": "set_address",
+    "set_download_path": "set_download_path",
+    "set_tmp_path": "set_tmp_path",
+    "set_cache_path": "set_cache_path",
+    "add_extension": "add_extension",
+    "incognito": "incognito",
+    "mute": "mute",
+    "no_imgs": "no_imgs",
+    "no_js": "no_js",
+    "ignore_certificate_errors": "ignore_certificate_errors",
+    "auto_port": "auto_port",
+}
+
+@functools.lru_cache(maxsize=16)
+def _window_size_arg(width: int, height: int) -> str:
+    """生成窗口大小启动参数
+    
+    Args:
+        width: 窗口宽度
+        height: 窗口高度
+    
+    Returns:
+        str: Chromium 的 --window-size 参数
+    """
+    return f'--window-size={width},{height}'
+
+
+# 驱动浏览器的阻塞调用共用的单线程执行器：DrissionPage 的 Driver 不能从多个线程并发
+# 发送 CDP 命令，MCP 工具调用和各 *_async 封装都在此按提交顺序执行
+_TOOL_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dp-mcp")
+
+# 浏览器状态缓存有效期（纳秒），期间重复查询不再发起 CDP 请求
+_STATUS_TTL_NS = 250_000_000
+
+# 每个无头浏览器实例最多保留的已“关闭”标签页数量，新建标签页时优先复用
+_PARKED_TABS_MAX = 4
+
+# 回收标签页前依次发送的 CDP 命令：清空会话历史，并撤销该标签页上的仿真、请求拦截和
+# 网络设置，使复用的标签页与新建的一致。任一命令失败时不回收，直接关闭标签页
+_TAB_RESET_CDP: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("Page.resetNavigationHistory", {}),
+    ("Emulation.clearDeviceMetricsOverride", {}),
+    ("Emulation.clearGeolocationOverride", {}),
+    ("Emulation.setEmulatedMedia", {"media": "", "features": []}),
+    ("Fetch.disable", {}),
+    ("Network.enable", {}),
+    ("Network.setBlockedURLs", {"urls": []}),
+    ("Network.setExtraHTTPHeaders", {"headers": {}}),
+    ("Network.disable", {}),
+)
+
+
 class BrowserManager:
     """浏览器单例管理器
     
-    使用单例模式管理全局唯一的浏览器实例，确保线程安全。
+    使用单例模式管理全局唯一的浏览器池，确保线程安全。
+    
+    浏览器实例按 (headless, window_size, user_agent, proxy) 缓存，切换配置时
+    复用已启动的进程，而不是关闭后重新启动。
     """
     
+    __slots__ = (
+        "_browser",
+        "_current_tab",
+        "_has_get_tabs",
+        "_active_key",
+        "_pool",
+        "_last_used",
+        "_current_tab_by_key",
+        "_parked_tabs",
+        "_reaper",
+        "_status_cache",
+        "_lifecycle_lock",
+        "_async_lock",
+        "_initialized",
+        "__weakref__",
+    )
+    
     _instance: Optional['BrowserManager'] = None
-    _lock = threading.Lock()
+    # 仅用于单例构造；实例生命周期由 _lifecycle_lock 保护
+    _lock = threading.RLock()
     
     def __new__(cls):
-        if cls._instance is None:
+        instance = cls._instance
+        if instance is None:
             with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
-    
-    def __init__(self):
-        """初始化浏览器管理器"""
-        if not hasattr(self, '_initialized'):
-            self._browser: Optional[Chromium] = None
-            self._current_tab = None
-            self._initialized = True
-            logger.info("浏览器管理器已初始化")
+                instance = cls._instance
+                if instance is None:
+                    # 在锁内完成全部初始化后再发布实例，避免其他线程看到半初始化对象
+                    instance = super().__new__(cls)
+                    instance._browser = None
+                    instance._current_tab = None
+                    instance._has_get_tabs = False
+                    instance._active_key = None
+                    instance._pool = OrderedDict()
+                    instance._last_used = {}
+                    instance._current_tab_by_key = {}
+                    instance._parked_tabs = {}
+                    instance._reaper = None
+                    instance._status_cache = None
+                    instance._lifecycle_lock = threading.RLock()
+                    instance._async_lock = None
+                    instance._initialized = True
+                    cls._instance = instance
+                    atexit.register(instance._quit_all)
+                    _enable_http_keepalive()
+                    logger.info("浏览器管理器已初始化")
+        return instance
     
     def init_browser(
         self,
@@ -51,61 +214,261 @@ class BrowserManager:
             window_size: 浏览器窗口大小，默认 (1920, 1080)
             user_agent: 自定义 User Agent
             proxy: 代理服务器地址
-            **kwargs: 其他 ChromiumOptions 参数
+            **kwargs: 其他 ChromiumOptions 参数，仅支持 _OPTION_SETTERS 中列出的方法
         
         Returns:
             Dict[str, Any]: 包含成功状态和浏览器信息
         """
-        with self._lock:
-            try:
-                if self._browser is not None:
+        # window_size 可能是 MCP 传入的列表，转为元组以便作为池键
+        pool_key = (headless, tuple(window_size), user_agent, proxy)
+        
+        try:
+            with self._lifecycle_lock:
+                pooled = pool_key in self._pool
+                if pooled:
+                    reused = pool_key != self._active_key
+                    self._activate(pool_key)
+            
+            if pooled:
+                if reused:
+                    logger.info("复用浏览器池中的已有实例")
+                else:
                     logger.warning("浏览器已经在运行中，返回现有实例")
+                return {
+                    "success": True,
+                    "message": "浏览器已在运行",
+                    "status": self.get_status()
+                }
+            
+            # 配置浏览器选项
+            options = ChromiumOptions()
+            
+            if headless:
+                options.headless()
+            
+            # 设置窗口大小（使用参数）
+            options.set_argument(_window_size_arg(window_size[0], window_size[1]))
+            
+            # 设置 User Agent
+            if user_agent:
+                options.set_user_agent(user_agent)
+            
+            # 设置代理
+            if proxy:
+                options.set_proxy(proxy)
+            
+            # 应用其他配置
+            for key, value in kwargs.items():
+                setter = _OPTION_SETTERS.get(key)
+                if setter is None:
+                    logger.warning("忽略不支持的浏览器配置项: %s", key)
+                    continue
+                getattr(options, setter)(value)
+            
+            # 池中已有实例时，新实例使用独立的端口和临时用户数据目录；否则会连接到
+            # 默认端口上已运行的浏览器，新的启动配置被静默忽略
+            with self._lifecycle_lock:
+                isolate = bool(self._pool)
+            if isolate and not _PORT_OPTIONS.intersection(kwargs):
+                options.auto_port()
+            
+            # 创建浏览器实例（耗时操作，不持有锁）
+            browser = Chromium(addr_or_opts=options)
+            
+            evicted = []
+            with self._lifecycle_lock:
+                if any(existing is browser for existing in self._pool.values()):
+                    # 连接到了池中已有的浏览器（端口相同），不能以新配置登记，也不能关闭
                     return {
-                        "success": True,
-                        "message": "浏览器已在运行",
-                        "status": self.get_status()
+                        "success": False,
+                        "error": "新配置的浏览器与已运行的实例使用了相同的端口，请指定不同的端口"
                     }
-                
-                # 配置浏览器选项
-                options = ChromiumOptions()
-                
-                if headless:
-                    options.headless()
-                
-                # 设置窗口大小（使用参数）
-                options.set_argument(f'--window-size={window_size[0]},{window_size[1]}')
-                
-                # 设置 User Agent
-                if user_agent:
-                    options.set_user_agent(user_agent)
-                
-                # 设置代理
-                if proxy:
-                    options.set_proxy(proxy)
-                
-                # 应用其他配置
-                for key, value in kwargs.items():
-                    if hasattr(options, key):
-                        getattr(options, key)(value)
-                
-                # 创建浏览器实例
-                self._browser = Chromium(addr_or_opts=options)
-                self._current_tab = self._browser.latest_tab
-                
-                logger.info("浏览器实例已创建")
-                
+                if pool_key in self._pool:
+                    # 其他线程已抢先完成初始化，丢弃本次创建的实例
+                    logger.warning("浏览器已由其他调用初始化，关闭重复实例")
+                    evicted.append(browser)
+                    launched = False
+                else:
+                    self._pool[pool_key] = browser
+                    self._current_tab_by_key[pool_key] = browser.latest_tab
+                    launched = True
+                    while len(self._pool) > _POOL_MAX_SIZE:
+                        evicted.append(self._discard(next(iter(self._pool))))
+                self._activate(pool_key)
+                self._start_reaper()
+            
+            for old in evicted:
+                self._quit(old)
+            
+            if not launched:
                 return {
                     "success": True,
-                    "message": "浏览器初始化成功",
+                    "message": "浏览器已在运行",
                     "status": self.get_status()
                 }
-                
+            
+            logger.info("浏览器实例已创建")
+            
+            return {
+                "success": True,
+                "message": "浏览器初始化成功",
+                "status": self.get_status()
+            }
+            
+        except Exception as e:
+            logger.error("初始化浏览器失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {
+                "success": False,
+                "error": f"初始化浏览器失败: {str(e)}"
+            }
+    
+    def _activate(self, key: tuple) -> None:
+        """将池中的实例设为当前浏览器（需持有生命周期锁）
+        
+        _browser 最后赋值，无锁读取方看到新实例时其余字段已经就绪。
+        
+        Args:
+            key: 浏览器池键
+        """
+        if self._active_key is not None and self._active_key in self._pool:
+            self._current_tab_by_key[self._active_key] = self._current_tab
+        
+        browser = self._pool[key]
+        self._pool.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+        self._status_cache = None
+        self._active_key = key
+        self._has_get_tabs = hasattr(browser, 'get_tabs')
+        self._current_tab = self._current_tab_by_key.get(key)
+        self._browser = browser
+    
+    def _discard(self, key: tuple) -> Chromium:
+        """从池中移除实例并返回，由调用方在锁外关闭（需持有生命周期锁）
+        
+        Args:
+            key: 浏览器池键
+        
+        Returns:
+            Chromium: 被移除的浏览器实例
+        """
+        browser = self._pool.pop(key)
+        self._last_used.pop(key, None)
+        self._current_tab_by_key.pop(key, None)
+        # 回收的标签页随浏览器一起失效
+        self._parked_tabs.pop(key, None)
+        if key == self._active_key:
+            # 先清空 _browser，无锁读取方不会再拿到即将关闭的实例
+            self._browser = None
+            self._status_cache = None
+            self._active_key = None
+            self._has_get_tabs = False
+            self._current_tab = None
+        return browser
+    
+    def _touch(self) -> None:
+        """记录当前浏览器的最近使用时间"""
+        key = self._active_key
+        if key is not None:
+            self._last_used[key] = time.monotonic()
+    
+    @staticmethod
+    def _quit(browser: Chromium) -> None:
+        """关闭浏览器实例，忽略关闭时的异常
+        
+        Args:
+            browser: 要关闭的浏览器实例
+        """
+        try:
+            browser.quit()
+        except Exception as e:
+            logger.warning("关闭浏览器实例失败: %s", e)
+    
+    def _quit_all(self) -> List[Exception]:
+        """关闭浏览器池中的所有实例
+        
+        Returns:
+            List[Exception]: 关闭过程中出现的异常
+        """
+        with self._lifecycle_lock:
+            browsers = [self._discard(key) for key in list(self._pool)]
+        
+        errors = []
+        for browser in browsers:
+            try:
+                browser.quit()
             except Exception as e:
-                logger.error(f"初始化浏览器失败: {str(e)}", exc_info=True)
-                return {
-                    "success": False,
-                    "error": f"初始化浏览器失败: {str(e)}"
-                }
+                errors.append(e)
+        return errors
+    
+    def _start_reaper(self) -> None:
+        """启动空闲实例回收线程（需持有生命周期锁）"""
+        if _IDLE_TIMEOUT_MS <= 0 or self._reaper is not None:
+            return
+        
+        self._reaper = threading.Thread(
+            target=self._reap_idle,
+            name="dp-mcp-reaper",
+            daemon=True
+        )
+        self._reaper.start()
+    
+    def _reap_idle(self) -> None:
+        """周期性关闭空闲超时的浏览器实例，当前使用的实例不会被关闭"""
+        timeout = _IDLE_TIMEOUT_MS / 1000
+        interval = min(timeout / 2, 60)
+        
+        while True:
+            time.sleep(interval)
+            self._reap_expired(timeout)
+    
+    def _reap_expired(self, timeout: float) -> List[tuple]:
+        """关闭超过 timeout 秒未使用的非当前实例
+        
+        Args:
+            timeout: 空闲超时时间（秒）
+        
+        Returns:
+            List[tuple]: 被关闭实例的池键
+        """
+        deadline = time.monotonic() - timeout
+        with self._lifecycle_lock:
+            expired: List[Tuple[tuple, Chromium]] = [
+                (key, self._discard(key))
+                for key in list(self._pool)
+                if key != self._active_key and self._last_used.get(key, 0) < deadline
+            ]
+        
+        for key, browser in expired:
+            logger.info("浏览器实例空闲超时，自动关闭: %s", key)
+            self._quit(browser)
+        return [key for key, _ in expired]
+    
+    async def init_browser_async(
+        self,
+        executor: Optional[Executor] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """在事件循环中初始化浏览器实例
+        
+        通过 asyncio.Lock 串行化并发的异步初始化请求，实际的阻塞启动在
+        线程池中执行，不会阻塞事件循环。
+        
+        Args:
+            executor: 执行阻塞调用的线程池，默认使用事件循环的默认执行器
+            **kwargs: 传递给 init_browser 的参数
+        
+        Returns:
+            Dict[str, Any]: 包含成功状态和浏览器信息
+        """
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        
+        async with self._async_lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor,
+                functools.partial(self.init_browser, **kwargs)
+            )
     
     def get_browser(self) -> Optional[Chromium]:
         """获取浏览器实例
@@ -113,6 +476,7 @@ class BrowserManager:
         Returns:
             Optional[Chromium]: 浏览器实例，如果未初始化则返回 None
         """
+        self._touch()
         return self._browser
     
     def get_current_tab(self):
@@ -121,14 +485,19 @@ class BrowserManager:
         Returns:
             当前标签页对象，如果浏览器未初始化则返回 None
         """
-        if self._browser is None:
+        browser = self._browser
+        if browser is None:
             return None
         
+        self._touch()
+        
         # 如果没有当前标签页或标签页已关闭，获取最新的标签页
-        if self._current_tab is None:
-            self._current_tab = self._browser.latest_tab
+        tab = self._current_tab
+        if tab is None:
+            tab = browser.latest_tab
+            self._current_tab = tab
         
-        return self._current_tab
+        return tab
     
     def set_current_tab(self, tab):
         """设置当前活跃的标签页
@@ -137,14 +506,95 @@ class BrowserManager:
             tab: 要设置为当前的标签页对象
         """
         self._current_tab = tab
+        self._status_cache = None
+    
+    def park_tab(self, tab) -> bool:
+        """将已“关闭”的标签页重置为空白页后留给当前浏览器复用
+        
+        仅无头模式回收：有头模式下空白标签页对用户可见。回收前清空会话历史和
+        单标签页状态（见 _reset_tab），复用时 back() 不会回到之前的页面。每个实例
+        最多保留 _PARKED_TABS_MAX 个，浏览器关闭时一并丢弃。
+        
+        Args:
+            tab: 当前浏览器中要关闭的标签页
+        
+        Returns:
+            bool: 是否已回收，False 时由调用方真正关闭标签页
+        """
+        with self._lifecycle_lock:
+            key = self._active_key
+            if key is None or not key[0] or len(self._parked_tabs.get(key, ())) >= _PARKED_TABS_MAX:
+                return False
+        
+        try:
+            tab.get("about:blank")
+            self._reset_tab(tab)
+        except Exception as e:
+            logger.debug("标签页回收失败: %s", e)
+            return False
+        
+        with self._lifecycle_lock:
+            # 导航期间浏览器可能已被关闭或切换
+            if key != self._active_key:
+                return False
+            parked = self._parked_tabs.setdefault(key, [])
+            if len(parked) >= _PARKED_TABS_MAX:
+                return False
+            parked.append(tab)
+            self._status_cache = None
+        return True
+    
+    @staticmethod
+    def _reset_tab(tab) -> None:
+        """清除标签页的会话历史、CDP 覆盖设置和 DrissionPage 的监听与弹窗处理
+        
+        Args:
+            tab: 已导航到空白页的标签页
+        """
+        for method, params in _TAB_RESET_CDP:
+            tab.run_cdp(method, **params)
+        listener = getattr(tab, "_listener", None)
+        if listener is not None and listener.listening:
+            listener.stop()
+        tab.set.auto_handle_alert(None)
+    
+    def take_parked_tab(self):
+        """取出当前浏览器最近回收的标签页
+        
+        Returns:
+            标签页对象，没有可复用的标签页时返回 None
+        """
+        with self._lifecycle_lock:
+            parked = self._parked_tabs.get(self._active_key)
+            if not parked:
+                return None
+            self._status_cache = None
+            return parked.pop()
+    
+    def parked_tab_ids(self) -> Set[str]:
+        """获取当前浏览器已回收标签页的 ID，列表和计数中应排除这些标签页"""
+        parked = self._parked_tabs.get(self._active_key, ())
+        return {tab.tab_id for tab in parked}
     
     def get_status(self) -> Dict[str, Any]:
         """获取浏览器状态
         
+        结果会缓存一小段时间，避免频繁轮询时重复发起 CDP 请求。
+        
         Returns:
             Dict[str, Any]: 包含浏览器状态信息
         """
-        if self._browser is None:
+        now = time.monotonic_ns()
+        cache = self._status_cache
+        if cache is not None and now - cache[0] < _STATUS_TTL_NS:
+            # 返回副本，调用方修改结果不会影响缓存
+            return dict(cache[1])
+        
+        browser = self._browser
+        has_get_tabs = self._has_get_tabs
+        browser_count = len(self._pool)
+        
+        if browser is None:
             return {
                 "running": False,
                 "message": "浏览器未初始化"
@@ -159,59 +609,62 @@ class BrowserManager:
                 }
             
             try:
-                tab_count = len(self._browser.get_tabs()) if hasattr(self._browser, 'get_tabs') else 1
+                if has_get_tabs:
+                    parked = self.parked_tab_ids()
+                    tab_count = sum(1 for t in browser.get_tabs() if t.tab_id not in parked)
+                else:
+                    tab_count = 1
             except:
                 tab_count = 1
             
-            return {
+            status = {
                 "running": True,
                 "url": tab.url,
                 "title": tab.title,
                 "tab_count": tab_count,
+                "browser_count": browser_count,
                 "message": "浏览器运行正常"
             }
+            
+            # 仅当期间没有切换浏览器时才写入缓存
+            if self._browser is browser:
+                self._status_cache = (now, dict(status))
+            
+            return status
         except Exception as e:
-            logger.error(f"获取浏览器状态失败: {str(e)}")
+            logger.error("获取浏览器状态失败: %s", e)
             return {
                 "running": False,
                 "error": f"获取状态失败: {str(e)}"
             }
     
     def close_browser(self) -> Dict[str, Any]:
-        """关闭浏览器实例
+        """关闭浏览器池中的所有实例
         
         Returns:
             Dict[str, Any]: 包含操作结果
         """
-        with self._lock:
-            try:
-                if self._browser is None:
-                    return {
-                        "success": True,
-                        "message": "浏览器未在运行"
-                    }
-                
-                self._browser.quit()
-                self._browser = None
-                self._current_tab = None
-                
-                logger.info("浏览器已关闭")
-                
-                return {
-                    "success": True,
-                    "message": "浏览器已成功关闭"
-                }
-                
-            except Exception as e:
-                logger.error(f"关闭浏览器失败: {str(e)}", exc_info=True)
-                # 即使出错也清理引用
-                self._browser = None
-                self._current_tab = None
-                
-                return {
-                    "success": False,
-                    "error": f"关闭浏览器失败: {str(e)}"
-                }
+        if not self._pool:
+            return {
+                "success": True,
+                "message": "浏览器未在运行"
+            }
+        
+        errors = self._quit_all()
+        if errors:
+            error = "; ".join(str(e) for e in errors)
+            logger.error("关闭浏览器失败: %s", error)
+            return {
+                "success": False,
+                "error": f"关闭浏览器失败: {error}"
+            }
+        
+        logger.info("浏览器已关闭")
+        
+        return {
+            "success": True,
+            "message": "浏览器已成功关闭"
+        }
     
     def is_running(self) -> bool:
         """检查浏览器是否在运行
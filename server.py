@@ -3,654 +3,830 @@
 基于 MCP (Model Context Protocol) 的浏览器自动化服务。
 """
 
+import asyncio
+import inspect
 import logging
 import json
-from typing import Any
+import os
+import signal
+import stat
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+# uvloop 仅支持类 Unix 平台，Windows 上保持默认的 ProactorEventLoop
+try:
+    import uvloop
+    USE_UVLOOP = True
+except ImportError:
+    USE_UVLOOP = False
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-from .browser import browser_manager
+from .browser import browser_manager, _TOOL_POOL
 from .tools import basic, markdown, advanced
 
-# 配置日志
+# 配置日志（默认 WARNING，可通过 DP_MCP_LOG_LEVEL 环境变量开启 INFO/DEBUG）；
+# 无效的级别名回退到 WARNING，宿主进程已配置日志时不覆盖其处理器
+_LOG_LEVEL = logging.getLevelName(os.environ.get("DP_MCP_LOG_LEVEL", "WARNING").upper())
 logging.basicConfig(
-    level=logging.INFO,
+    level=_LOG_LEVEL if isinstance(_LOG_LEVEL, int) else logging.WARNING,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+if not isinstance(_LOG_LEVEL, int):
+    logger.warning("DP_MCP_LOG_LEVEL 无效: %s，使用 WARNING", os.environ.get("DP_MCP_LOG_LEVEL"))
 
 # 创建 MCP 服务器实例
 app = Server("drissionpage-mcp")
 
 
+class _NonBlockingStdout:
+    """非阻塞的 stdout 写入器
+    
+    将输出分块写入非阻塞的文件描述符，管道缓冲区写满时让出事件循环并稍后
+    重试，而不是阻塞整个事件循环。
+    """
+    
+    _CHUNK_SIZE = 4096
+    _RETRY_DELAY = 0.005
+    
+    def __init__(self, fd: int):
+        self._fd = fd
+    
+    def restore(self) -> None:
+        """恢复文件描述符的阻塞模式，退出前调用"""
+        try:
+            os.set_blocking(self._fd, True)
+        except OSError as e:
+            logger.debug("恢复 stdout 阻塞模式失败: %s", e)
+    
+    async def write(self, data: str) -> int:
+        buf = memoryview(data.encode("utf-8"))
+        offset = 0
+        while offset < len(buf):
+            try:
+                offset += os.write(self._fd, buf[offset:offset + self._CHUNK_SIZE])
+            except BlockingIOError:
+                await anyio.sleep(self._RETRY_DELAY)
+        return len(data)
+    
+    async def flush(self) -> None:
+        # 直接写入文件描述符，没有需要刷新的缓冲区
+        pass
+
+
+def _dumps(obj: Any) -> str:
+    """将工具结果序列化为紧凑 JSON
+    
+    优先使用 orjson（C 扩展），未安装时回退到标准库 json。
+    
+    Args:
+        obj: 要序列化的对象
+    
+    Returns:
+        str: JSON 字符串
+    """
+    if USE_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _make_stdout() -> Optional[_NonBlockingStdout]:
+    """创建非阻塞 stdout 写入器
+    
+    O_NONBLOCK 作用于共享的打开文件描述，会波及共用同一管道的 stdin/stderr，
+    因此只在 stdout 是独立的管道时启用；退出时由 main() 调用 restore 恢复阻塞模式。
+    
+    Returns:
+        Optional[_NonBlockingStdout]: 当前环境不支持时返回 None，使用 SDK 默认实现
+    """
+    if "stdout" not in inspect.signature(stdio_server).parameters:
+        return None
+    
+    try:
+        fd = sys.stdout.fileno()
+        info = os.fstat(fd)
+        if not stat.S_ISFIFO(info.st_mode):
+            return None
+        for stream in (sys.stdin, sys.stderr):
+            try:
+                other = os.fstat(stream.fileno())
+            except (AttributeError, OSError, ValueError):
+                continue
+            if (other.st_dev, other.st_ino) == (info.st_dev, info.st_ino):
+                return None
+        os.set_blocking(fd, False)
+    except (AttributeError, OSError, ValueError) as e:
+        logger.warning("无法将 stdout 设置为非阻塞模式: %s", e)
+        return None
+    
+    return _NonBlockingStdout(fd)
+
+
 # ============================================================================
 # 浏览器管理工具
 # ============================================================================
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """列出所有可用的工具"""
-    return [
-        # 浏览器管理
-        Tool(
-            name="init_browser",
-            description="初始化浏览器实例，支持自定义配置（无头/有头模式、窗口大小等）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "headless": {
-                        "type": "boolean",
-                        "description": "是否使用无头模式，默认 False",
-                        "default": False
-                    },
-                    "window_size": {
-                        "type": "array",
-                        "description": "浏览器窗口大小 [width, height]",
-                        "items": {"type": "integer"},
-                        "default": [1920, 1080]
-                    }
+# 工具列表在进程内不变，导入时构建一次，避免每次 tools/list 请求重复构造
+_TOOLS_CACHE: list[Tool] = [
+    # 浏览器管理
+    Tool(
+        name="init_browser",
+        description="初始化浏览器实例，支持自定义配置（无头/有头模式、窗口大小等）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "headless": {
+                    "type": "boolean",
+                    "description": "是否使用无头模式，默认 False",
+                    "default": False
+                },
+                "window_size": {
+                    "type": "array",
+                    "description": "浏览器窗口大小 [width, height]",
+                    "items": {"type": "integer"},
+                    "default": [1920, 1080]
                 }
             }
-        ),
-        Tool(
-            name="get_browser_status",
-            description="获取当前浏览器状态（URL、标题、是否活跃等）",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="close_browser",
-            description="关闭浏览器实例，释放资源",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        
-        # 基础操作
-        Tool(
-            name="navigate",
-            description="导航到指定 URL",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "目标网址"
-                    },
-                    "timeout": {
-                        "type": "integer",
-                        "description": "超时时间（秒）",
-                        "default": 30
-                    }
+        }
+    ),
+    Tool(
+        name="get_browser_status",
+        description="获取当前浏览器状态（URL、标题、是否活跃等）",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="close_browser",
+        description="关闭浏览器实例，释放资源",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    
+    # 基础操作
+    Tool(
+        name="navigate",
+        description="导航到指定 URL",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "目标网址"
                 },
-                "required": ["url"]
-            }
-        ),
-        Tool(
-            name="find_elements",
-            description="查找页面元素，支持 CSS、XPath、文本选择器",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath, text",
-                        "enum": ["css", "xpath", "text"],
-                        "default": "css"
-                    },
-                    "single": {
-                        "type": "boolean",
-                        "description": "是否只返回第一个元素",
-                        "default": False
-                    },
-                    "timeout": {
-                        "type": "number",
-                        "description": "等待超时时间（秒）",
-                        "default": 10
-                    }
+                "timeout": {
+                    "type": "integer",
+                    "description": "超时时间（秒）",
+                    "default": 30
+                }
+            },
+            "required": ["url"]
+        }
+    ),
+    Tool(
+        name="find_elements",
+        description="查找页面元素，支持 CSS、XPath、文本选择器",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
                 },
-                "required": ["selector"]
-            }
-        ),
-        Tool(
-            name="click_element",
-            description="点击指定元素",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath, text",
-                        "enum": ["css", "xpath", "text"],
-                        "default": "css"
-                    },
-                    "timeout": {
-                        "type": "number",
-                        "description": "等待超时时间（秒）",
-                        "default": 10
-                    }
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
                 },
-                "required": ["selector"]
-            }
-        ),
-        Tool(
-            name="input_text",
-            description="向元素输入文本",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "text": {
-                        "type": "string",
-                        "description": "要输入的文本"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath",
-                        "enum": ["css", "xpath"],
-                        "default": "css"
-                    },
-                    "clear_first": {
-                        "type": "boolean",
-                        "description": "是否先清空原有内容",
-                        "default": True
-                    }
+                "single": {
+                    "type": "boolean",
+                    "description": "是否只返回第一个元素",
+                    "default": False
                 },
-                "required": ["selector", "text"]
-            }
-        ),
-        Tool(
-            name="get_element_text",
-            description="获取元素文本内容",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath",
-                        "enum": ["css", "xpath"],
-                        "default": "css"
-                    }
+                "timeout": {
+                    "type": "number",
+                    "description": "等待超时时间（秒）",
+                    "default": 10
+                }
+            },
+            "required": ["selector"]
+        }
+    ),
+    Tool(
+        name="click_element",
+        description="点击指定元素",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
                 },
-                "required": ["selector"]
-            }
-        ),
-        Tool(
-            name="get_element_attribute",
-            description="获取元素属性值",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "attribute": {
-                        "type": "string",
-                        "description": "属性名"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath",
-                        "enum": ["css", "xpath"],
-                        "default": "css"
-                    }
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
                 },
-                "required": ["selector", "attribute"]
-            }
-        ),
-        Tool(
-            name="wait_for_element",
-            description="等待元素出现",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "选择器字符串"
-                    },
-                    "selector_type": {
-                        "type": "string",
-                        "description": "选择器类型：css, xpath",
-                        "enum": ["css", "xpath"],
-                        "default": "css"
-                    },
-                    "timeout": {
-                        "type": "number",
-                        "description": "超时时间（秒）",
-                        "default": 30
-                    }
+                "timeout": {
+                    "type": "number",
+                    "description": "等待超时时间（秒）",
+                    "default": 10
+                }
+            },
+            "required": ["selector"]
+        }
+    ),
+    Tool(
+        name="input_text",
+        description="向元素输入文本",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
                 },
-                "required": ["selector"]
-            }
-        ),
-        Tool(
-            name="scroll_page",
-            description="滚动页面",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "direction": {
-                        "type": "string",
-                        "description": "滚动方向",
-                        "enum": ["up", "down", "left", "right", "top", "bottom"],
-                        "default": "down"
-                    },
-                    "amount": {
-                        "type": ["string", "integer"],
-                        "description": "滚动量：page, half, 或具体像素数",
-                        "default": "page"
-                    }
+                "text": {
+                    "type": "string",
+                    "description": "要输入的文本"
+                },
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
+                },
+                "clear_first": {
+                    "type": "boolean",
+                    "description": "是否先清空原有内容",
+                    "default": True
                 }
-            }
-        ),
-        Tool(
-            name="take_screenshot",
-            description="页面截图",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "保存路径，如果为空则自动生成"
-                    },
-                    "full_page": {
-                        "type": "boolean",
-                        "description": "是否截取整个页面",
-                        "default": False
-                    }
+            },
+            "required": ["selector", "text"]
+        }
+    ),
+    Tool(
+        name="get_element_text",
+        description="获取元素文本内容",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
+                },
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
                 }
-            }
-        ),
-        Tool(
-            name="execute_javascript",
-            description="执行自定义 JavaScript 代码",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script": {
-                        "type": "string",
-                        "description": "JavaScript 代码"
-                    }
+            },
+            "required": ["selector"]
+        }
+    ),
+    Tool(
+        name="get_element_attribute",
+        description="获取元素属性值",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
                 },
-                "required": ["script"]
-            }
-        ),
-        
-        # Markdown 转换
-        Tool(
-            name="page_to_markdown",
-            description="将当前页面转换为 Markdown 并保存（核心功能）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "保存的文件路径"
-                    },
-                    "include_images": {
-                        "type": "boolean",
-                        "description": "是否包含图片",
-                        "default": True
-                    },
-                    "remove_ads": {
-                        "type": "boolean",
-                        "description": "是否移除广告元素",
-                        "default": True
-                    },
-                    "extract_main": {
-                        "type": "boolean",
-                        "description": "是否只提取主要内容区域",
-                        "default": True
-                    },
-                    "add_metadata": {
-                        "type": "boolean",
-                        "description": "是否添加元数据（标题、URL等）",
-                        "default": True
-                    }
+                "attribute": {
+                    "type": "string",
+                    "description": "属性名"
                 },
-                "required": ["file_path"]
-            }
-        ),
-        Tool(
-            name="get_page_content",
-            description="获取当前页面内容（不保存文件）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format": {
-                        "type": "string",
-                        "description": "返回格式",
-                        "enum": ["markdown", "html", "text"],
-                        "default": "markdown"
-                    },
-                    "extract_main": {
-                        "type": "boolean",
-                        "description": "是否只提取主要内容",
-                        "default": True
-                    },
-                    "remove_ads": {
-                        "type": "boolean",
-                        "description": "是否移除广告",
-                        "default": True
-                    }
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
                 }
-            }
-        ),
-        
-        # 高级功能
-        Tool(
-            name="extract_table_data",
-            description="提取网页表格数据为结构化格式（JSON/CSV）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "表格选择器",
-                        "default": "table"
-                    },
-                    "format": {
-                        "type": "string",
-                        "description": "输出格式",
-                        "enum": ["json", "csv"],
-                        "default": "json"
-                    },
-                    "output_file": {
-                        "type": "string",
-                        "description": "可选的输出文件路径"
-                    }
+            },
+            "required": ["selector", "attribute"]
+        }
+    ),
+    Tool(
+        name="wait_for_element",
+        description="等待元素出现",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "选择器字符串"
+                },
+                "selector_type": {
+                    "type": "string",
+                    "description": "选择器类型：css, xpath, text",
+                    "enum": ["css", "xpath", "text"],
+                    "default": "css"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "超时时间（秒）",
+                    "default": 30
+                }
+            },
+            "required": ["selector"]
+        }
+    ),
+    Tool(
+        name="scroll_page",
+        description="滚动页面",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "direction": {
+                    "type": "string",
+                    "description": "滚动方向",
+                    "enum": ["up", "down", "left", "right", "top", "bottom"],
+                    "default": "down"
+                },
+                "amount": {
+                    "type": ["string", "integer"],
+                    "description": "滚动量：page, half, 或具体像素数",
+                    "default": "page"
                 }
             }
-        ),
-        Tool(
-            name="smart_extract",
-            description="智能数据抓取，根据选择器提取多个元素的结构化数据",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "容器元素选择器"
-                    },
-                    "fields": {
-                        "type": "object",
-                        "description": "字段映射，{字段名: 子选择器}",
-                        "additionalProperties": {"type": "string"}
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "最多提取的项数",
-                        "default": 100
-                    }
+        }
+    ),
+    Tool(
+        name="take_screenshot",
+        description="页面截图",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "保存路径，如果为空则自动生成"
                 },
-                "required": ["selector", "fields"]
+                "full_page": {
+                    "type": "boolean",
+                    "description": "是否截取整个页面",
+                    "default": False
+                }
             }
-        ),
-        Tool(
-            name="fill_form",
-            description="自动填写表单",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "fields": {
+        }
+    ),
+    Tool(
+        name="execute_javascript",
+        description="执行自定义 JavaScript 代码",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "script": {
+                    "type": "string",
+                    "description": "JavaScript 代码"
+                }
+            },
+            "required": ["script"]
+        }
+    ),
+    Tool(
+        name="batch_actions",
+        description="在一次调用中按顺序执行多个点击、输入、取文本操作",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "actions": {
+                    "type": "array",
+                    "description": "操作列表，按顺序执行",
+                    "items": {
                         "type": "object",
-                        "description": "字段映射，{选择器: 值}",
-                        "additionalProperties": True
-                    },
-                    "submit_selector": {
-                        "type": "string",
-                        "description": "提交按钮选择器，如果为空则不提交"
+                        "properties": {
+                            "action": {
+                                "type": "string",
+                                "description": "操作类型：click, input, get_text",
+                                "enum": ["click", "input", "get_text"]
+                            },
+                            "selector": {
+                                "type": "string",
+                                "description": "选择器字符串"
+                            },
+                            "selector_type": {
+                                "type": "string",
+                                "description": "选择器类型：css, xpath, text",
+                                "enum": ["css", "xpath", "text"],
+                                "default": "css"
+                            },
+                            "text": {
+                                "type": "string",
+                                "description": "要输入的文本（input 操作必填）"
+                            },
+                            "clear_first": {
+                                "type": "boolean",
+                                "description": "输入前是否清空原有内容",
+                                "default": True
+                            }
+                        },
+                        "required": ["action", "selector"]
                     }
                 },
-                "required": ["fields"]
-            }
-        ),
-        Tool(
-            name="handle_infinite_scroll",
-            description="处理无限滚动/懒加载，自动滚动直到内容不再增加",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "max_scrolls": {
-                        "type": "integer",
-                        "description": "最大滚动次数",
-                        "default": 10
-                    },
-                    "scroll_pause": {
-                        "type": "number",
-                        "description": "每次滚动后的等待时间（秒）",
-                        "default": 2
-                    },
-                    "check_selector": {
-                        "type": "string",
-                        "description": "用于检查新内容的选择器"
-                    }
+                "timeout": {
+                    "type": "number",
+                    "description": "每个操作等待元素出现的超时时间（秒）",
+                    "default": 10
+                },
+                "stop_on_error": {
+                    "type": "boolean",
+                    "description": "某个操作失败时是否停止后续操作",
+                    "default": True
+                }
+            },
+            "required": ["actions"]
+        }
+    ),
+    
+    # Markdown 转换
+    Tool(
+        name="page_to_markdown",
+        description="将当前页面转换为 Markdown 并保存（核心功能）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "保存的文件路径"
+                },
+                "include_images": {
+                    "type": "boolean",
+                    "description": "是否包含图片",
+                    "default": True
+                },
+                "remove_ads": {
+                    "type": "boolean",
+                    "description": "是否移除广告元素",
+                    "default": True
+                },
+                "extract_main": {
+                    "type": "boolean",
+                    "description": "是否只提取主要内容区域",
+                    "default": True
+                },
+                "converter": {
+                    "type": "string",
+                    "description": "Markdown 转换器，auto 时依次优先 html_to_markdown、markdownify、html2text",
+                    "enum": ["auto", "html_to_markdown", "markdownify", "html2text"],
+                    "default": "auto"
+                },
+                "add_metadata": {
+                    "type": "boolean",
+                    "description": "是否添加元数据（标题、URL等）",
+                    "default": True
+                }
+            },
+            "required": ["file_path"]
+        }
+    ),
+    Tool(
+        name="get_page_content",
+        description="获取当前页面内容（不保存文件）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "description": "返回格式",
+                    "enum": ["markdown", "html", "text"],
+                    "default": "markdown"
+                },
+                "extract_main": {
+                    "type": "boolean",
+                    "description": "是否只提取主要内容",
+                    "default": True
+                },
+                "remove_ads": {
+                    "type": "boolean",
+                    "description": "是否移除广告",
+                    "default": True
+                },
+                "converter": {
+                    "type": "string",
+                    "description": "Markdown 转换器，auto 时依次优先 html_to_markdown、markdownify、html2text",
+                    "enum": ["auto", "html_to_markdown", "markdownify", "html2text"],
+                    "default": "auto"
                 }
             }
-        ),
-        Tool(
-            name="manage_cookies",
-            description="Cookie 管理（获取、设置、删除）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "action": {
-                        "type": "string",
-                        "description": "操作类型",
-                        "enum": ["get", "set", "delete", "clear"]
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "Cookie 名称"
-                    },
-                    "value": {
-                        "type": "string",
-                        "description": "Cookie 值（set 时需要）"
-                    },
-                    "domain": {
-                        "type": "string",
-                        "description": "Cookie 域名"
-                    }
+        }
+    ),
+    
+    # 高级功能
+    Tool(
+        name="extract_table_data",
+        description="提取网页表格数据为结构化格式（JSON/CSV）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "表格选择器",
+                    "default": "table"
+                },
+                "format": {
+                    "type": "string",
+                    "description": "输出格式",
+                    "enum": ["json", "csv"],
+                    "default": "json"
                 },
-                "required": ["action"]
+                "output_file": {
+                    "type": "string",
+                    "description": "可选的输出文件路径"
+                }
             }
-        ),
-        Tool(
-            name="switch_to_tab",
-            description="Tab 页切换管理（新建、切换、关闭、列表）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "action": {
-                        "type": "string",
-                        "description": "操作类型",
-                        "enum": ["new", "switch", "close", "list"]
-                    },
-                    "url": {
-                        "type": "string",
-                        "description": "新标签页 URL 或要切换到的 URL"
-                    },
-                    "index": {
-                        "type": "integer",
-                        "description": "标签页索引"
-                    },
-                    "title_pattern": {
-                        "type": "string",
-                        "description": "标签页标题模式"
-                    }
+        }
+    ),
+    Tool(
+        name="smart_extract",
+        description="智能数据抓取，根据选择器提取多个元素的结构化数据",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "容器元素选择器"
                 },
-                "required": ["action"]
+                "fields": {
+                    "type": "object",
+                    "description": "字段映射，{字段名: 子选择器}",
+                    "additionalProperties": {"type": "string"}
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "最多提取的项数",
+                    "default": 100
+                }
+            },
+            "required": ["selector", "fields"]
+        }
+    ),
+    Tool(
+        name="fill_form",
+        description="自动填写表单",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fields": {
+                    "type": "object",
+                    "description": "字段映射，{选择器: 值}",
+                    "additionalProperties": True
+                },
+                "submit_selector": {
+                    "type": "string",
+                    "description": "提交按钮选择器，如果为空则不提交"
+                }
+            },
+            "required": ["fields"]
+        }
+    ),
+    Tool(
+        name="handle_infinite_scroll",
+        description="处理无限滚动/懒加载，自动滚动直到内容不再增加",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "max_scrolls": {
+                    "type": "integer",
+                    "description": "最大滚动次数",
+                    "default": 10
+                },
+                "scroll_pause": {
+                    "type": "number",
+                    "description": "每次滚动后的等待时间（秒）",
+                    "default": 2
+                },
+                "check_selector": {
+                    "type": "string",
+                    "description": "用于检查新内容的选择器"
+                }
             }
-        ),
-    ]
+        }
+    ),
+    Tool(
+        name="manage_cookies",
+        description="Cookie 管理（获取、设置、删除）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "description": "操作类型",
+                    "enum": ["get", "set", "delete", "clear"]
+                },
+                "name": {
+                    "type": "string",
+                    "description": "Cookie 名称"
+                },
+                "value": {
+                    "type": "string",
+                    "description": "Cookie 值（set 时需要）"
+                },
+                "domain": {
+                    "type": "string",
+                    "description": "Cookie 域名"
+                }
+            },
+            "required": ["action"]
+        }
+    ),
+    Tool(
+        name="switch_to_tab",
+        description="Tab 页切换管理（新建、切换、关闭、列表）",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "description": "操作类型",
+                    "enum": ["new", "switch", "close", "list"]
+                },
+                "url": {
+                    "type": "string",
+                    "description": "新标签页 URL 或要切换到的 URL"
+                },
+                "index": {
+                    "type": "integer",
+                    "description": "标签页索引"
+                },
+                "title_pattern": {
+                    "type": "string",
+                    "description": "标签页标题模式"
+                }
+            },
+            "required": ["action"]
+        }
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """列出所有可用的工具"""
+    return _TOOLS_CACHE
+
+
+# init_browser 的默认窗口大小
+_DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+# 工具分发表：工具名 -> 接收参数字典并返回结果的处理函数
+_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    # 浏览器管理
+    "init_browser": lambda a: browser_manager.init_browser(
+        headless=a.get("headless", False),
+        window_size=a.get("window_size") or _DEFAULT_WINDOW_SIZE
+    ),
+    "get_browser_status": lambda a: browser_manager.get_status(),
+    "close_browser": lambda a: browser_manager.close_browser(),
+    
+    # 基础操作
+    "navigate": lambda a: basic.navigate(
+        url=a["url"],
+        timeout=a.get("timeout", 30)
+    ),
+    "find_elements": lambda a: basic.find_elements(
+        selector=a["selector"],
+        selector_type=a.get("selector_type", "css"),
+        single=a.get("single", False),
+        timeout=a.get("timeout", 10)
+    ),
+    "click_element": lambda a: basic.click_element(
+        selector=a["selector"],
+        selector_type=a.get("selector_type", "css"),
+        timeout=a.get("timeout", 10)
+    ),
+    "input_text": lambda a: basic.input_text(
+        selector=a["selector"],
+        text=a["text"],
+        selector_type=a.get("selector_type", "css"),
+        clear_first=a.get("clear_first", True)
+    ),
+    "get_element_text": lambda a: basic.get_element_text(
+        selector=a["selector"],
+        selector_type=a.get("selector_type", "css")
+    ),
+    "get_element_attribute": lambda a: basic.get_element_attribute(
+        selector=a["selector"],
+        attribute=a["attribute"],
+        selector_type=a.get("selector_type", "css")
+    ),
+    "wait_for_element": lambda a: basic.wait_for_element(
+        selector=a["selector"],
+        selector_type=a.get("selector_type", "css"),
+        timeout=a.get("timeout", 30)
+    ),
+    "scroll_page": lambda a: basic.scroll_page(
+        direction=a.get("direction", "down"),
+        amount=a.get("amount", "page")
+    ),
+    "take_screenshot": lambda a: basic.take_screenshot(
+        file_path=a.get("file_path"),
+        full_page=a.get("full_page", False)
+    ),
+    "execute_javascript": lambda a: basic.execute_javascript(
+        script=a["script"]
+    ),
+    "batch_actions": lambda a: basic.batch_actions(
+        actions=a["actions"],
+        timeout=a.get("timeout", 10),
+        stop_on_error=a.get("stop_on_error", True)
+    ),
+    
+    # Markdown 转换
+    "page_to_markdown": lambda a: markdown.page_to_markdown(
+        file_path=a["file_path"],
+        include_images=a.get("include_images", True),
+        remove_ads=a.get("remove_ads", True),
+        extract_main=a.get("extract_main", True),
+        converter=a.get("converter", "auto"),
+        add_metadata=a.get("add_metadata", True)
+    ),
+    "get_page_content": lambda a: markdown.get_page_content(
+        format=a.get("format", "markdown"),
+        extract_main=a.get("extract_main", True),
+        remove_ads=a.get("remove_ads", True),
+        converter=a.get("converter", "auto")
+    ),
+    
+    # 高级功能
+    "extract_table_data": lambda a: advanced.extract_table_data(
+        selector=a.get("selector", "table"),
+        format=a.get("format", "json"),
+        output_file=a.get("output_file")
+    ),
+    "smart_extract": lambda a: advanced.smart_extract(
+        selector=a["selector"],
+        fields=a["fields"],
+        limit=a.get("limit", 100)
+    ),
+    "fill_form": lambda a: advanced.fill_form(
+        fields=a["fields"],
+        submit_selector=a.get("submit_selector")
+    ),
+    "handle_infinite_scroll": lambda a: advanced.handle_infinite_scroll(
+        max_scrolls=a.get("max_scrolls", 10),
+        scroll_pause=a.get("scroll_pause", 2),
+        check_selector=a.get("check_selector")
+    ),
+    "manage_cookies": lambda a: advanced.manage_cookies(
+        action=a["action"],
+        name=a.get("name"),
+        value=a.get("value"),
+        domain=a.get("domain")
+    ),
+    "switch_to_tab": lambda a: advanced.switch_to_tab(
+        action=a["action"],
+        url=a.get("url"),
+        index=a.get("index"),
+        title_pattern=a.get("title_pattern")
+    ),
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """调用工具"""
     try:
-        logger.info(f"调用工具: {name}, 参数: {arguments}")
-        
-        # 浏览器管理
-        if name == "init_browser":
-            window_size = arguments.get("window_size", [1920, 1080])
-            result = browser_manager.init_browser(
-                headless=arguments.get("headless", False),
-                window_size=tuple(window_size)
-            )
-        elif name == "get_browser_status":
-            result = browser_manager.get_status()
-        elif name == "close_browser":
-            result = browser_manager.close_browser()
+        logger.info("调用工具: %s, 参数: %s", name, arguments)
         
-        # 基础操作
-        elif name == "navigate":
-            result = basic.navigate(
-                url=arguments["url"],
-                timeout=arguments.get("timeout", 30)
-            )
-        elif name == "find_elements":
-            result = basic.find_elements(
-                selector=arguments["selector"],
-                selector_type=arguments.get("selector_type", "css"),
-                single=arguments.get("single", False),
-                timeout=arguments.get("timeout", 10)
-            )
-        elif name == "click_element":
-            result = basic.click_element(
-                selector=arguments["selector"],
-                selector_type=arguments.get("selector_type", "css"),
-                timeout=arguments.get("timeout", 10)
-            )
-        elif name == "input_text":
-            result = basic.input_text(
-                selector=arguments["selector"],
-                text=arguments["text"],
-                selector_type=arguments.get("selector_type", "css"),
-                clear_first=arguments.get("clear_first", True)
-            )
-        elif name == "get_element_text":
-            result = basic.get_element_text(
-                selector=arguments["selector"],
-                selector_type=arguments.get("selector_type", "css")
-            )
-        elif name == "get_element_attribute":
-            result = basic.get_element_attribute(
-                selector=arguments["selector"],
-                attribute=arguments["attribute"],
-                selector_type=arguments.get("selector_type", "css")
-            )
-        elif name == "wait_for_element":
-            result = basic.wait_for_element(
-                selector=arguments["selector"],
-                selector_type=arguments.get("selector_type", "css"),
-                timeout=arguments.get("timeout", 30)
-            )
-        elif name == "scroll_page":
-            result = basic.scroll_page(
-                direction=arguments.get("direction", "down"),
-                amount=arguments.get("amount", "page")
-            )
-        elif name == "take_screenshot":
-            result = basic.take_screenshot(
-                file_path=arguments.get("file_path"),
-                full_page=arguments.get("full_page", False)
-            )
-        elif name == "execute_javascript":
-            result = basic.execute_javascript(
-                script=arguments["script"]
-            )
-        
-        # Markdown 转换
-        elif name == "page_to_markdown":
-            result = markdown.page_to_markdown(
-                file_path=arguments["file_path"],
-                include_images=arguments.get("include_images", True),
-                remove_ads=arguments.get("remove_ads", True),
-                extract_main=arguments.get("extract_main", True),
-                add_metadata=arguments.get("add_metadata", True)
-            )
-        elif name == "get_page_content":
-            result = markdown.get_page_content(
-                format=arguments.get("format", "markdown"),
-                extract_main=arguments.get("extract_main", True),
-                remove_ads=arguments.get("remove_ads", True)
-            )
-        
-        # 高级功能
-        elif name == "extract_table_data":
-            result = advanced.extract_table_data(
-                selector=arguments.get("selector", "table"),
-                format=arguments.get("format", "json"),
-                output_file=arguments.get("output_file")
-            )
-        elif name == "smart_extract":
-            result = advanced.smart_extract(
-                selector=arguments["selector"],
-                fields=arguments["fields"],
-                limit=arguments.get("limit", 100)
-            )
-        elif name == "fill_form":
-            result = advanced.fill_form(
-                fields=arguments["fields"],
-                submit_selector=arguments.get("submit_selector")
-            )
-        elif name == "handle_infinite_scroll":
-            result = advanced.handle_infinite_scroll(
-                max_scrolls=arguments.get("max_scrolls", 10),
-                scroll_pause=arguments.get("scroll_pause", 2),
-                check_selector=arguments.get("check_selector")
-            )
-        elif name == "manage_cookies":
-            result = advanced.manage_cookies(
-                action=arguments["action"],
-                name=arguments.get("name"),
-                value=arguments.get("value"),
-                domain=arguments.get("domain")
-            )
-        elif name == "switch_to_tab":
-            result = advanced.switch_to_tab(
-                action=arguments["action"],
-                url=arguments.get("url"),
-                index=arguments.get("index"),
-                title_pattern=arguments.get("title_pattern")
-            )
-        
-        else:
+        handler = _DISPATCH.get(name)
+        if handler is None:
             result = {
                 "success": False,
                 "error": f"未知的工具: {name}"
             }
+        else:
+            # 阻塞的 DrissionPage 调用在线程池中执行，避免阻塞事件循环
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_TOOL_POOL, handler, arguments)
         
         # 格式化结果
-        result_text = json.dumps(result, ensure_ascii=False, indent=2)
-        logger.info(f"工具执行结果: {result_text[:200]}...")
+        result_text = _dumps(result)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("工具执行结果: %.200s...", result_text)
         
         return [TextContent(type="text", text=result_text)]
         
     except Exception as e:
-        logger.error(f"工具执行失败: {str(e)}", exc_info=True)
+        logger.error("工具执行失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         error_result = {
             "success": False,
             "error": str(e)
@@ -658,19 +834,99 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
 
 
+def _install_signal_handlers(task: asyncio.Task) -> List[int]:
+    """收到终止信号时取消主任务，由 main() 的 finally 统一关闭浏览器
+    
+    Returns:
+        List[int]: 已收到的信号，main() 据此区分信号退出与其他取消
+    """
+    received: List[int] = []
+    
+    def _shutdown(signum: int) -> None:
+        received.append(signum)
+        task.cancel()
+    
+    signals = [signal.SIGTERM]
+    # 作为 stdio 子进程运行时 SIGINT 由父进程转发，仅在交互式终端中接管
+    if sys.stdin.isatty():
+        signals.append(signal.SIGINT)
+    
+    loop = asyncio.get_running_loop()
+    for signum in signals:
+        try:
+            loop.add_signal_handler(signum, _shutdown, signum)
+        except NotImplementedError:
+            # Windows 事件循环不支持信号回调，退出时由 atexit 关闭浏览器
+            break
+    return received
+
+
+def _prewarm_options() -> Dict[str, Any]:
+    """从环境变量读取预热浏览器的启动参数
+    
+    DP_MCP_PREWARM_HEADLESS=1 使用无头模式，DP_MCP_PREWARM_WINDOW_SIZE 形如
+    "1280x720"；未设置时与 init_browser 工具的默认参数一致。
+    """
+    window_size = _DEFAULT_WINDOW_SIZE
+    raw = os.environ.get("DP_MCP_PREWARM_WINDOW_SIZE")
+    if raw:
+        try:
+            width, height = (int(v) for v in raw.lower().split("x"))
+            window_size = (width, height)
+        except ValueError:
+            logger.warning("DP_MCP_PREWARM_WINDOW_SIZE 格式无效: %s，使用默认窗口大小", raw)
+    return {
+        "headless": os.environ.get("DP_MCP_PREWARM_HEADLESS", "0") == "1",
+        "window_size": window_size
+    }
+
+
+async def _prewarm_browser() -> None:
+    """在后台预热浏览器，与 MCP 初始化握手并行进行"""
+    result = await browser_manager.init_browser_async(executor=_TOOL_POOL, **_prewarm_options())
+    if not result.get("success"):
+        logger.warning("预热浏览器失败: %s", result.get('error'))
+
+
 async def main():
     """启动 MCP 服务器"""
     logger.info("启动 DrissionPage MCP 服务器...")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    signals = _install_signal_handlers(asyncio.current_task())
+    
+    # 设置 DP_MCP_PREWARM=1 时提前启动浏览器，隐藏首次工具调用的冷启动耗时；
+    # 预热任务与工具调用共用单线程池。只有参数与预热参数一致的 init_browser 才会复用该
+    # 实例，其他参数仍会启动新的浏览器，因此需按客户端的用法设置 DP_MCP_PREWARM_* 参数
+    prewarm = None
+    if os.environ.get("DP_MCP_PREWARM") == "1":
+        prewarm = asyncio.create_task(_prewarm_browser())
+    
+    stdout = _make_stdout()
+    stdio = stdio_server(stdout=stdout) if stdout is not None else stdio_server()
+    
+    try:
+        async with stdio as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    except asyncio.CancelledError:
+        # 终止信号取消主任务后正常退出，其他来源的取消照常向上传递
+        if not signals:
+            raise
+    finally:
+        if prewarm is not None and not prewarm.done():
+            prewarm.cancel()
+        basic.fsync_pending()
+        browser_manager.close_browser()
+        if stdout is not None:
+            stdout.restore()
 
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
+    if USE_UVLOOP:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
@@ -0,0 +1,91 @@
+"""单元测试公共配置
+
+测试不启动真实浏览器，浏览器和标签页均由测试替身代替。
+"""
+
+import itertools
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 与 test_example.py 一致，以项目根目录为导入路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import browser  # noqa: E402
+
+
+class FakeTab:
+    """模拟 DrissionPage 的标签页"""
+    
+    _ids = itertools.count()
+    
+    def __init__(self, owner=None, url="about:blank"):
+        self.tab_id = f"tab-{next(self._ids)}"
+        self.owner = owner
+        self.url = url
+        self.title = ""
+        self.closed = False
+        self.cdp_calls = []
+        self.failing_cdp = set()
+        self.alert_handling = "manual"
+        self.set = SimpleNamespace(auto_handle_alert=self._auto_handle_alert)
+    
+    def _auto_handle_alert(self, on_off=True, accept=True):
+        self.alert_handling = on_off
+    
+    def get(self, url):
+        self.url = url
+    
+    def run_cdp(self, method, **kwargs):
+        self.cdp_calls.append(method)
+        if method in self.failing_cdp:
+            raise RuntimeError(method)
+        return {}
+    
+    def close(self):
+        self.closed = True
+        self.owner.tabs.remove(self)
+
+
+class FakeChromium:
+    """模拟 DrissionPage 的 Chromium：未开启 auto_port 时按地址复用已有实例"""
+    
+    by_address = {}
+    
+    def __new__(cls, addr_or_opts=None):
+        if not addr_or_opts.is_auto_port:
+            existing = cls.by_address.get(addr_or_opts.address)
+            if existing is not None:
+                return existing
+        instance = super().__new__(cls)
+        instance.options = addr_or_opts
+        instance.tabs = []
+        instance.latest_tab = instance.new_tab()
+        instance.quitted = False
+        if not addr_or_opts.is_auto_port:
+            cls.by_address[addr_or_opts.address] = instance
+        return instance
+    
+    def __init__(self, addr_or_opts=None):
+        pass
+    
+    def new_tab(self, url="about:blank"):
+        tab = FakeTab(self, url)
+        self.tabs.append(tab)
+        return tab
+    
+    def get_tabs(self):
+        return list(self.tabs)
+    
+    def quit(self):
+        self.quitted = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(browser, "Chromium", FakeChromium)
+    monkeypatch.setattr(browser.BrowserManager, "_instance", None)
+    FakeChromium.by_address.clear()
+    return browser.BrowserManager()
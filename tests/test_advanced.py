@@ -0,0 +1,325 @@
+"""高级工具单元测试"""
+
+import asyncio
+import json
+import shutil
+import subprocess
+import threading
+import time
+
+import pytest
+
+from tools import advanced
+
+
+class FakeElement:
+    def __init__(self, tag="span", text="", attrs=None):
+        self.tag = tag
+        self.text = text
+        self.attrs = attrs or {}
+    
+    def attr(self, name):
+        return self.attrs.get(name)
+
+
+class FakeContainer:
+    """记录每次子元素查询所在的线程和定位字符串"""
+    
+    def __init__(self, index, calls, locators=None):
+        self.index = index
+        self.calls = calls
+        self.locators = [] if locators is None else locators
+    
+    def ele(self, selector, timeout=None):
+        self.calls.append(threading.get_ident())
+        self.locators.append(selector)
+        return FakeElement(text=f" {selector} {self.index} ")
+
+
+class FakeTab:
+    tab_id = "tab-1"
+    
+    def __init__(self, containers=()):
+        self.containers = list(containers)
+        self.locators = []
+    
+    def eles(self, selector, timeout=None):
+        self.locators.append(selector)
+        return self.containers
+
+
+@pytest.fixture
+def use_tab(monkeypatch):
+    def use(tab):
+        # BrowserManager 使用 __slots__，只能替换类上的方法
+        manager_cls = type(advanced.browser_manager)
+        monkeypatch.setattr(manager_cls, "ensure_browser", lambda self: True)
+        monkeypatch.setattr(manager_cls, "get_current_tab", lambda self: tab)
+        return tab
+    return use
+
+
+def test_smart_extract_fallback_is_sequential(use_tab):
+    """DrissionPage 语法的逐元素提取在调用线程中依次发送查询"""
+    calls = []
+    use_tab(FakeTab(FakeContainer(i, calls) for i in range(5)))
+    
+    result = advanced.smart_extract("xpath://li", {"name": "xpath:./b"})
+    
+    assert result["success"]
+    assert [item["name"] for item in result["data"]] == [f"xpath:./b {i}" for i in range(5)]
+    assert set(calls) == {threading.get_ident()}
+
+
+def test_smart_extract_fallback_locates_plain_selectors_as_css(use_tab):
+    """逐元素提取时无前缀的选择器按 CSS 定位，与页面内提取一致"""
+    locators = []
+    tab = use_tab(FakeTab([FakeContainer(0, [], locators)]))
+    
+    result = advanced.smart_extract("li.item", {"name": "xpath:./b", "price": "span.price"})
+    
+    assert result["success"]
+    assert tab.locators == ["css:li.item"]
+    assert locators == ["xpath:./b", "css:span.price"]
+
+
+def test_smart_extract_async_runs_on_tool_pool(use_tab):
+    """并发的异步提取在共用的单线程执行器中依次执行"""
+    threads = []
+    active = []
+    
+    class SlowContainer(FakeContainer):
+        def ele(self, selector, timeout=None):
+            active.append(1)
+            assert len(active) == 1, "两个提取同时驱动了标签页"
+            threads.append(threading.current_thread().name)
+            time.sleep(0.01)
+            active.pop()
+            return FakeElement(text=selector)
+    
+    use_tab(FakeTab([SlowContainer(i, []) for i in range(3)]))
+    
+    async def run():
+        return await asyncio.gather(*(
+            advanced.smart_extract_async("xpath://li", {"name": "xpath:./b"}) for _ in range(3)
+        ))
+    
+    results = asyncio.run(run())
+    
+    assert all(result["success"] for result in results)
+    assert {name.split("_")[0] for name in threads} == {"dp-mcp"}
+
+
+def run_page_script(script, dom_js, *args, this="null"):
+    """用 Node.js 在模拟的 DOM 中执行页面脚本，返回脚本的返回值；this 为 dom_js 中定义的元素表达式"""
+    if shutil.which("node") is None:
+        pytest.skip("需要 Node.js 执行页面脚本")
+    source = (
+        "globalThis.window = globalThis;\n" + dom_js + "\n"
+        f"const result = new Function({json.dumps(script)}).apply({this}, {json.dumps(list(args))});\n"
+        "process.stdout.write(JSON.stringify(result));"
+    )
+    out = subprocess.run(["node", "-e", source], capture_output=True, text=True, timeout=30, check=True)
+    return json.loads(out.stdout)
+
+
+def test_smart_extract_script_reads_svg_text():
+    """字段匹配到没有 innerText 的 SVG 元素时读取 textContent，不中断整个提取"""
+    dom = """
+    const item = {querySelector: q => q === 'text'
+        ? {tagName: 'text', textContent: ' 42 '}
+        : {tagName: 'SPAN', innerText: ' ok '}};
+    globalThis.document = {
+        createDocumentFragment: () => ({querySelector: () => null}),
+        querySelectorAll: () => [item],
+    };
+    """
+    result = run_page_script(advanced._SMART_EXTRACT_JS, dom, "k", "li", {"value": "text", "name": "span"}, 10)
+    
+    assert json.loads(result) == [{"value": "42", "name": "ok"}]
+
+
+class ScriptTab(FakeTab):
+    """run_js 依次返回预设结果的标签页"""
+    
+    def __init__(self, *results):
+        super().__init__()
+        self.results = list(results)
+        self.scripts = []
+    
+    def run_js(self, script, *args, **kwargs):
+        self.scripts.append(script)
+        return self.results.pop(0)
+
+
+def test_smart_extract_decodes_json_result(use_tab):
+    """页面内提取以 JSON 字符串返回，一次 run_js 取回全部数据"""
+    tab = use_tab(ScriptTab('[{"title": "a", "link": {"text": "x", "href": "/x"}}, {"title": null, "link": null}]'))
+    
+    result = advanced.smart_extract("li", {"title": "b", "link": "a"})
+    
+    assert result["success"]
+    assert result["data"] == [
+        {"title": "a", "link": {"text": "x", "href": "/x"}},
+        {"title": None, "link": None},
+    ]
+    assert len(tab.scripts) == 1
+
+
+def test_fill_form_batches_probed_text_inputs(use_tab):
+    """探测结果以 JSON 字符串返回，文本框在页面内批量赋值"""
+    tab = use_tab(ScriptTab(
+        '[{"tag": "input", "type": "email", "checked": false}, {"tag": "textarea", "type": "", "checked": false}]',
+        [True, True],
+    ))
+    
+    result = advanced.fill_form({"#email": "a@example.com", "css:#bio": "hi"})
+    
+    assert result["success"]
+    assert result["filled_fields"] == ["#email", "css:#bio"]
+    assert len(tab.scripts) == 2
+
+
+class Checkbox(FakeElement):
+    def __init__(self):
+        super().__init__(tag="input", attrs={"type": "checkbox"})
+        self.clicks = 0
+    
+    def click(self):
+        self.clicks += 1
+
+
+def test_fill_form_fallback_uses_css_locator(use_tab):
+    """逐个填写时按 CSS 定位，不把无前缀的选择器当作文本匹配"""
+    checkbox = Checkbox()
+    located = []
+    tab = use_tab(ScriptTab('[{"tag": "input", "type": "checkbox", "checked": false}]'))
+    tab.ele = lambda locator, timeout=None: located.append(locator) or checkbox
+    
+    result = advanced.fill_form({"input[name=remember]": True})
+    
+    assert result["success"]
+    assert located == ["css:input[name=remember]"]
+    assert checkbox.clicks == 1
+
+
+class CookieTab(FakeTab):
+    """Network.getCookies 返回当前 Cookie 表，并统计 CDP 调用次数"""
+    
+    def __init__(self):
+        super().__init__()
+        self.jar = [{"name": "sid", "value": "1", "domain": "a.example"}]
+        self.cdp_calls = []
+    
+    @property
+    def url(self):
+        raise AssertionError("读取 Cookies 不应额外查询页面 URL")
+    
+    def run_cdp(self, method, **kwargs):
+        self.cdp_calls.append(method)
+        return {"cookies": [dict(c, path="/") for c in self.jar]}
+
+
+def test_get_cookies_sees_changes_made_by_the_page(use_tab):
+    """页面修改 Cookies 后立即读到新值，每次读取只发起一次 CDP 调用"""
+    tab = use_tab(CookieTab())
+    
+    assert advanced.manage_cookies("get", name="sid")["value"] == "1"
+    tab.jar[0]["value"] = "2"
+    result = advanced.manage_cookies("get")
+    
+    assert result["cookies"] == [{"name": "sid", "value": "2", "domain": "a.example"}]
+    assert tab.cdp_calls == ["Network.getCookies", "Network.getCookies"]
+
+
+@pytest.fixture
+def tabs_manager(manager, monkeypatch):
+    monkeypatch.setattr(advanced, "browser_manager", manager)
+    advanced._tabs_cache.clear()
+    return manager
+
+
+def test_switch_to_tab_reuses_closed_tab_in_headless(tabs_manager):
+    """无头模式下关闭的标签页从列表中隐藏，新建时复用"""
+    tabs_manager.init_browser(headless=True)
+    assert advanced.switch_to_tab("new", url="https://a.example")["success"]
+    closed = tabs_manager.get_current_tab()
+    
+    assert advanced.switch_to_tab("close")["success"]
+    assert not closed.closed
+    assert len(advanced._visible_tabs(tabs_manager.get_browser(), None)) == 1
+    
+    result = advanced.switch_to_tab("new", url="https://b.example")
+    assert result["url"] == "https://b.example"
+    assert tabs_manager.get_current_tab() is closed
+
+
+def test_switch_to_tab_closes_tab_in_headed_mode(tabs_manager):
+    """有头模式下关闭标签页时真正关闭，不留下空白标签页"""
+    tabs_manager.init_browser()
+    advanced.switch_to_tab("new", url="https://a.example")
+    closed = tabs_manager.get_current_tab()
+    
+    assert advanced.switch_to_tab("close")["success"]
+    assert closed.closed
+    assert tabs_manager.get_browser().get_tabs() == [tabs_manager.get_current_tab()]
+
+
+def test_table_script_pages_after_filtering_rows():
+    """表头行和空行在分页前过滤，批次下标与 total 一致"""
+    dom = """
+    const cell = (tag, text) => ({tagName: tag, innerText: text});
+    const row = (tag, ...texts) => ({cells: texts.map(t => cell(tag, t))});
+    const table = {tHead: null, tBodies: [], rows: [
+        row('TH', ' Name ', 'Age'), row('TD', 'a', '1'), row('TD'), row('TD', 'b', '2'), row('TD', 'c', '3'),
+    ]};
+    """
+    
+    page = run_page_script(advanced._TABLE_JS, dom, True, 1, 3, this="table")
+    
+    assert page == {"headers": ["Name", "Age"], "rows": [["b", "2"], ["c", "3"]], "total": 3}
+
+
+class TableTab(FakeTab):
+    """表格按 _TABLE_JS 的参数分页返回，记录每次请求的区间"""
+    
+    def __init__(self, headers, rows):
+        super().__init__()
+        self.headers = headers
+        self.rows = rows
+        self.pages = []
+    
+    def ele(self, selector, timeout=None):
+        return self
+    
+    def run_js(self, script, include_header, start, end):
+        self.pages.append((start, end))
+        rows = self.rows[start:] if end < 0 else self.rows[start:end]
+        return {"headers": self.headers, "rows": rows, "total": len(self.rows)}
+
+
+def test_extract_table_csv_streams_batches(use_tab, monkeypatch, tmp_path):
+    """CSV 导出分批读取表格并逐行写入，表头只写一次"""
+    monkeypatch.setattr(advanced, "_TABLE_BATCH_SIZE", 2)
+    tab = use_tab(TableTab(["name", "age"], [["a", "1"], ["b", "2"], ["c", "3"], ["d", "4"], ["e", "5"]]))
+    target = tmp_path / "out" / "table.csv"
+    
+    result = advanced.extract_table_data(format="csv", output_file=str(target))
+    
+    assert result["success"]
+    assert result["row_count"] == 5
+    assert result["column_count"] == 2
+    assert tab.pages == [(0, 2), (2, 4), (4, 6)]
+    assert target.read_text(encoding="utf-8").splitlines() == ["name,age", "a,1", "b,2", "c,3", "d,4", "e,5"]
+
+
+def test_extract_table_json_reads_once(use_tab):
+    """JSON 格式一次读取整张表格，以表头作为键"""
+    tab = use_tab(TableTab(["name", "age"], [["a", "1"], ["b", "2"]]))
+    
+    result = advanced.extract_table_data()
+    
+    assert result["success"]
+    assert tab.pages == [(0, -1)]
+    assert result["data"]["rows"] == [{"name": "a", "age": "1"}, {"name": "b", "age": "2"}]
+    assert result["data"]["row_count"] == 2
@@ -0,0 +1,215 @@
+"""基础工具单元测试"""
+
+import json
+
+import pytest
+
+from tools import basic
+
+
+class FakeTab:
+    tab_id = "tab-1"
+    
+    def __init__(self, js_result=None):
+        self.js_result = js_result
+        self.calls = []
+    
+    def run_js(self, script, *args, **kwargs):
+        self.calls.append(args)
+        return self.js_result
+    
+    def get_screenshot(self, path=None, as_bytes=None, full_page=False):
+        return b"\x89PNG fake"
+
+
+@pytest.fixture
+def use_tab(monkeypatch):
+    def use(tab):
+        monkeypatch.setattr(basic, "_get_tab", lambda: (tab, None))
+        return tab
+    return use
+
+
+def test_screenshot_written_in_background(use_tab, tmp_path):
+    """截图文件在后台写入，fsync_pending 后内容完整"""
+    use_tab(FakeTab())
+    target = tmp_path / "shots" / "page.png"
+    
+    result = basic.take_screenshot(str(target))
+    
+    assert result["success"]
+    assert result["pending"] is True
+    assert basic.fsync_pending(timeout=5) == []
+    assert target.read_bytes() == b"\x89PNG fake"
+
+
+def test_screenshot_path_error_reported(use_tab, tmp_path):
+    """目标路径无法写入时返回失败，而不是在后台静默出错"""
+    use_tab(FakeTab())
+    blocker = tmp_path / "file.txt"
+    blocker.write_text("x")
+    
+    result = basic.take_screenshot(str(blocker / "page.png"))
+    
+    assert not result["success"]
+    assert "截图失败" in result["error"]
+    assert basic.fsync_pending(timeout=5) == []
+
+
+_ACTIONS = [
+    {"action": "click", "selector": "#go"},
+    {"action": "get_text", "selector": "#missing"},
+    {"action": "get_text", "selector": "#go"},
+]
+
+
+def test_batch_actions_stop_on_error(use_tab):
+    """stop_on_error 传入页面脚本，失败后只返回已执行的操作"""
+    tab = use_tab(FakeTab(json.dumps([
+        {"action": "click", "selector": "#go", "success": True},
+        {"action": "get_text", "selector": "#missing", "success": False, "error": "未找到元素: #missing"},
+    ])))
+    
+    result = basic.batch_actions(_ACTIONS, timeout=1)
+    
+    (options,), = tab.calls
+    assert options["stopOnError"] is True
+    assert options["waitMs"] == 1000
+    assert not result["success"]
+    assert result["succeeded"] == 1
+    assert len(result["results"]) == 2
+    assert result["message"].startswith("已执行 2/3")
+
+
+def test_batch_actions_continue_on_error(use_tab):
+    """stop_on_error=False 时执行全部操作"""
+    tab = use_tab(FakeTab(json.dumps([
+        {"action": "click", "selector": "#go", "success": True},
+        {"action": "get_text", "selector": "#missing", "success": False},
+        {"action": "get_text", "selector": "#go", "success": True, "text": "Go", "tag": "button"},
+    ])))
+    
+    result = basic.batch_actions(_ACTIONS, stop_on_error=False)
+    
+    assert tab.calls[0][0]["stopOnError"] is False
+    assert result["succeeded"] == 2
+    assert result["results"][2]["text"] == "Go"
+
+
+def test_batch_actions_validates_before_running(use_tab):
+    """参数错误时不执行任何操作"""
+    tab = use_tab(FakeTab())
+    
+    result = basic.batch_actions(_ACTIONS + [{"action": "hover", "selector": "#go"}])
+    
+    assert not result["success"]
+    assert "第 4 个操作" in result["error"]
+    assert tab.calls == []
+
+
+class FakeElement:
+    tag = "span"
+    text = "Alice"
+    
+    def __init__(self):
+        self.clicked = False
+    
+    def click(self):
+        self.clicked = True
+
+
+class LocatorTab(FakeTab):
+    """页面脚本返回每个操作成功，DrissionPage 定位记录定位字符串"""
+    
+    def __init__(self, elements):
+        super().__init__()
+        self.elements = elements
+        self.located = []
+    
+    def run_js(self, script, *args, **kwargs):
+        self.calls.append(args)
+        return json.dumps([
+            {"action": step[0], "selector": step[1], "success": True}
+            for step in args[0]["actions"]
+        ])
+    
+    def ele(self, locator, timeout=None):
+        self.located.append(locator)
+        return self.elements.get(locator)
+
+
+def test_batch_actions_normalizes_dp_selectors(use_tab):
+    """带 DrissionPage 前缀的选择器与单个操作工具一致；页面脚本无法表达的语法逐个执行"""
+    tab = use_tab(LocatorTab({"@id=name": FakeElement()}))
+    
+    result = basic.batch_actions([
+        {"action": "click", "selector": "css:#go"},
+        {"action": "click", "selector": "x://button"},
+        {"action": "get_text", "selector": "@id=name"},
+        {"action": "input", "selector": "#q", "text": "hi"},
+    ])
+    
+    assert result["success"]
+    assert [options["actions"] for (options,) in tab.calls] == [
+        [["click", "#go", "css", "", True], ["click", "//button", "xpath", "", True]],
+        [["input", "#q", "css", "hi", True]],
+    ]
+    assert tab.located == ["@id=name"]
+    assert result["results"][2]["text"] == "Alice"
+    assert [r["selector"] for r in result["results"]] == ["css:#go", "x://button", "@id=name", "#q"]
+
+
+def test_batch_actions_stop_on_error_across_groups(use_tab):
+    """DrissionPage 执行的操作失败时，后续页面脚本不再执行"""
+    tab = use_tab(LocatorTab({}))
+    
+    result = basic.batch_actions([
+        {"action": "click", "selector": "#go"},
+        {"action": "click", "selector": "@id=missing"},
+        {"action": "click", "selector": "#next"},
+    ])
+    
+    assert len(tab.calls) == 1
+    assert not result["success"]
+    assert result["results"][1]["error"] == "未找到元素: @id=missing"
+    assert result["message"].startswith("已执行 2/3")
+
+
+class ElementsTab(FakeTab):
+    """eles 返回预设元素，run_js 按元素返回信息或抛出异常"""
+    
+    def __init__(self, elements, fail=False):
+        super().__init__()
+        self.elements = elements
+        self.fail = fail
+    
+    def eles(self, locator, timeout=None):
+        return self.elements
+    
+    def run_js(self, script, *args, **kwargs):
+        self.calls.append(args)
+        if self.fail:
+            raise RuntimeError("元素已失效")
+        return json.dumps([{"tag": e.tag, "text": e.text, "attrs": {}} for e in args])
+
+
+def test_find_elements_reads_info_in_one_call(use_tab):
+    """前 10 个元素的信息一次 run_js 读取"""
+    tab = use_tab(ElementsTab([FakeElement() for _ in range(15)]))
+    
+    result = basic.find_elements("span")
+    
+    assert result["count"] == 15
+    assert len(result["elements"]) == 10
+    assert [len(args) for args in tab.calls] == [10]
+
+
+def test_find_elements_falls_back_per_element(use_tab):
+    """批量读取失败时逐个读取元素信息"""
+    element = FakeElement()
+    element.attrs = {"id": "name"}
+    use_tab(ElementsTab([element], fail=True))
+    
+    result = basic.find_elements("span")
+    
+    assert result["elements"] == [{"tag": "span", "text": "Alice", "attrs": {"id": "name"}}]
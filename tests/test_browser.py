@@ -0,0 +1,198 @@
+"""浏览器池单元测试"""
+
+import inspect
+import os
+import threading
+
+import pytest
+
+import browser
+
+
+def test_pool_keys_get_separate_browsers(manager):
+    """不同配置的池键各自启动独立端口的浏览器"""
+    assert manager.init_browser()["success"]
+    first = manager.get_browser()
+    assert not first.options.is_auto_port
+    
+    assert manager.init_browser(headless=True)["success"]
+    second = manager.get_browser()
+    assert second is not first
+    assert second.options.is_auto_port
+    assert len(manager._pool) == 2
+
+
+def test_pool_rejects_browser_on_same_port(manager):
+    """显式指定相同端口时报错，且不关闭已在使用的浏览器"""
+    assert manager.init_browser()["success"]
+    first = manager.get_browser()
+    
+    result = manager.init_browser(headless=True, set_local_port=first.options.address.split(":")[-1])
+    assert not result["success"]
+    assert not first.quitted
+    assert len(manager._pool) == 1
+    assert manager.get_browser() is first
+
+
+def test_reaper_disabled_by_default(manager):
+    """未设置 DP_MCP_BROWSER_IDLE_TIMEOUT_MS 时不启动空闲回收线程"""
+    if "DP_MCP_BROWSER_IDLE_TIMEOUT_MS" in os.environ:
+        pytest.skip("环境变量中已设置空闲超时")
+    assert browser._IDLE_TIMEOUT_MS == 0
+    manager.init_browser()
+    assert manager._reaper is None
+
+
+def test_reaper_keeps_current_browser(manager):
+    """空闲回收只关闭非当前实例"""
+    manager.init_browser()
+    idle = manager.get_browser()
+    manager.init_browser(headless=True)
+    current = manager.get_browser()
+    
+    reaped = manager._reap_expired(timeout=-1)
+    
+    assert len(reaped) == 1
+    assert idle.quitted
+    assert not current.quitted
+    assert manager.get_browser() is current
+
+
+def test_status_cache_returns_copies(manager):
+    """修改 get_status 的返回值不影响之后的调用"""
+    manager.init_browser()
+    status = manager.get_status()
+    status["running"] = False
+    status["tab_count"] = -1
+    
+    cached = manager.get_status()
+    assert cached["running"] is True
+    assert cached["tab_count"] != -1
+
+
+def test_parked_tabs_only_in_headless_mode(manager):
+    """有头模式下不回收标签页"""
+    manager.init_browser()
+    tab = manager.get_browser().new_tab("https://example.com")
+    
+    assert not manager.park_tab(tab)
+    assert tab.url == "https://example.com"
+
+
+def test_parked_tabs_excluded_from_status(manager):
+    """回收的标签页不计入 tab_count，取出后重新计入"""
+    manager.init_browser(headless=True)
+    tab = manager.get_browser().new_tab("https://example.com")
+    
+    assert manager.park_tab(tab)
+    assert tab.url == "about:blank"
+    assert manager.parked_tab_ids() == {tab.tab_id}
+    assert manager.get_status()["tab_count"] == 1
+    
+    assert manager.take_parked_tab() is tab
+    assert manager.take_parked_tab() is None
+    assert manager.get_status()["tab_count"] == 2
+
+
+def test_parked_tabs_are_reset(manager):
+    """回收的标签页清空会话历史和单标签页状态；重置失败时真正关闭"""
+    manager.init_browser(headless=True)
+    tab = manager.get_browser().new_tab("https://example.com")
+    
+    assert manager.park_tab(tab)
+    assert tab.cdp_calls[0] == "Page.resetNavigationHistory"
+    assert {"Fetch.disable", "Emulation.clearDeviceMetricsOverride"} <= set(tab.cdp_calls)
+    assert tab.alert_handling is None
+    
+    broken = manager.get_browser().new_tab("https://example.com")
+    broken.failing_cdp.add("Page.resetNavigationHistory")
+    assert not manager.park_tab(broken)
+    assert manager.parked_tab_ids() == {tab.tab_id}
+
+
+def test_parked_tabs_dropped_with_browser(manager):
+    """浏览器关闭后不再复用其回收的标签页"""
+    manager.init_browser(headless=True)
+    manager.park_tab(manager.get_browser().new_tab())
+    
+    manager.close_browser()
+    manager.init_browser(headless=True)
+    
+    assert manager.take_parked_tab() is None
+    assert manager.parked_tab_ids() == set()
+
+
+@pytest.fixture
+def browser_driver(monkeypatch):
+    driver = pytest.importorskip("DrissionPage._base.driver").BrowserDriver
+    # 测试结束后恢复原始实现
+    monkeypatch.setattr(driver, "get", inspect.getattr_static(driver, "get"))
+    return driver
+
+
+def test_keepalive_off_by_default(browser_driver, monkeypatch):
+    """未设置 DP_MCP_HTTP_KEEPALIVE=1 时不替换 DrissionPage 的实现"""
+    monkeypatch.delenv("DP_MCP_HTTP_KEEPALIVE", raising=False)
+    monkeypatch.setattr(browser.BrowserManager, "_instance", None)
+    original = inspect.getattr_static(browser_driver, "get")
+    
+    browser.BrowserManager()
+    browser._enable_http_keepalive()
+    
+    assert inspect.getattr_static(browser_driver, "get") is original
+
+
+def test_keepalive_timeout_not_retried(browser_driver, monkeypatch):
+    """keep-alive 请求超时时直接报错，不再用新连接重试"""
+    requests = pytest.importorskip("requests")
+    monkeypatch.setenv("DP_MCP_HTTP_KEEPALIVE", "1")
+    fallback = []
+    monkeypatch.setattr(browser_driver, "get", staticmethod(lambda url: fallback.append(url)))
+    
+    def timeout(self, url, **kwargs):
+        raise requests.exceptions.ReadTimeout(url)
+    
+    monkeypatch.setattr(requests.Session, "get", timeout)
+    browser._enable_http_keepalive()
+    patched = inspect.getattr_static(browser_driver, "get")
+    browser._enable_http_keepalive()
+    
+    assert inspect.getattr_static(browser_driver, "get") is patched
+    with pytest.raises(requests.exceptions.Timeout):
+        browser_driver.get("http://127.0.0.1:9/json")
+    assert fallback == []
+
+
+def test_keepalive_skips_unexpected_signature(browser_driver, monkeypatch):
+    """BrowserDriver.get 的签名变化时不替换"""
+    monkeypatch.setenv("DP_MCP_HTTP_KEEPALIVE", "1")
+    changed = staticmethod(lambda url, timeout=None: None)
+    monkeypatch.setattr(browser_driver, "get", changed)
+    
+    browser._enable_http_keepalive()
+    
+    assert inspect.getattr_static(browser_driver, "get") is changed
+
+
+def test_singleton_published_fully_initialized(monkeypatch):
+    """多个线程同时构造时只创建一个实例，且任何线程拿到的都是初始化完成的对象"""
+    monkeypatch.setattr(browser.BrowserManager, "_instance", None)
+    registered = []
+    monkeypatch.setattr(browser.atexit, "register", registered.append)
+    barrier = threading.Barrier(8)
+    seen = []
+    
+    def build():
+        barrier.wait()
+        instance = browser.BrowserManager()
+        seen.append((instance, instance._lifecycle_lock is not None and instance._pool == {}))
+    
+    threads = [threading.Thread(target=build) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len({id(instance) for instance, _ in seen}) == 1
+    assert all(ready for _, ready in seen)
+    assert len(registered) == 1
@@ -0,0 +1,134 @@
+"""Markdown 工具单元测试"""
+
+import pytest
+
+from tools import markdown
+
+
+class SnapshotTab:
+    """run_js 依次返回预设快照，并记录传入的缓存参数"""
+    
+    tab_id = "tab-md"
+    
+    def __init__(self, *snaps):
+        self.snaps = list(snaps)
+        self.calls = []
+    
+    def run_js(self, script, *args, **kwargs):
+        self.calls.append(args)
+        return self.snaps.pop(0)
+
+
+def test_snapshot_reuses_cached_html(monkeypatch):
+    """内容指纹未变时页面不返回 html，使用缓存"""
+    monkeypatch.setattr(markdown, "_html_cache", type(markdown._html_cache)())
+    base = {"url": "https://a.example/", "title": "A", "origin": 1.5, "stamp": "6:1:https://a.example/"}
+    tab = SnapshotTab({**base, "html": "<p>a</p>"}, dict(base))
+    
+    first = markdown._get_page_snapshot(tab)
+    second = markdown._get_page_snapshot(tab)
+    
+    assert first["html"] == second["html"] == "<p>a</p>"
+    assert tab.calls[0][:2] == (-1, "")
+    assert tab.calls[1][:2] == (1.5, "6:1:https://a.example/")
+
+
+_EMPHASIS_HTML = "<h2>T</h2><p><b>bold</b> <em>em</em></p><ul><li>a</li></ul>"
+
+
+def test_markdownify_emphasis_uses_single_symbol():
+    """markdownify 输出 **粗体** 和 *斜体*，而不是重复的强调符号"""
+    pytest.importorskip("markdownify")
+    content = markdown._html_to_markdown_markdownify(_EMPHASIS_HTML)
+    assert "**bold** *em*" in content
+    assert "****" not in content
+
+
+def test_converters_agree_on_emphasis():
+    """html-to-markdown 与 markdownify 的标题、列表和强调符号一致"""
+    pytest.importorskip("markdownify")
+    pytest.importorskip("html_to_markdown")
+    assert (
+        markdown._html_to_markdown_rust(_EMPHASIS_HTML).strip()
+        == markdown._html_to_markdown_markdownify(_EMPHASIS_HTML).strip()
+    )
+
+
+def test_get_page_content_honours_converter(monkeypatch):
+    """显式指定转换器时不随已安装的库变化"""
+    monkeypatch.setattr(markdown, "_html_cache", type(markdown._html_cache)())
+    manager_cls = type(markdown.browser_manager)
+    tab = SnapshotTab({"url": "u", "title": "t", "origin": 1.0, "stamp": "s", "html": "<p>x</p>"})
+    monkeypatch.setattr(manager_cls, "ensure_browser", lambda self: True)
+    monkeypatch.setattr(manager_cls, "get_current_tab", lambda self: tab)
+    monkeypatch.setattr(markdown, "USE_HTML2TEXT", False)
+    
+    result = markdown.get_page_content(converter="html2text")
+    assert not result["success"]
+    assert result["error"] == "html2text 未安装"
+    
+    if markdown.USE_MARKDOWNIFY:
+        result = markdown.get_page_content(converter="markdownify")
+        assert result["success"]
+        assert result["converter"] == "markdownify"
+
+
+_PAGE_HTML = (
+    "<html><body><nav>menu</nav>"
+    "<main><h1>Title</h1><p>Body <b>text</b></p><div class=\"ad-banner\">buy</div>"
+    "<script>track()</script><p>tail</p></main>"
+    "<div class=\"footer\">copyright</div></body></html>"
+)
+
+
+@pytest.fixture(params=[True, False], ids=["lxml", "bs4"])
+def clean_backend(request, monkeypatch):
+    """分别使用 lxml 和 BeautifulSoup 实现清理 HTML"""
+    if request.param:
+        if not markdown.USE_LXML_CSS:
+            pytest.skip("需要 lxml 和 cssselect")
+    else:
+        pytest.importorskip("bs4")
+        pytest.importorskip("soupsieve")
+    monkeypatch.setattr(markdown, "USE_LXML_CSS", request.param)
+
+
+def test_clean_and_extract_keeps_main_content(clean_backend):
+    """只保留主要内容区域，并移除其中的广告和脚本"""
+    html = markdown._clean_and_extract(_PAGE_HTML)
+    
+    assert "Title" in html and "tail" in html
+    for removed in ("menu", "buy", "track()", "copyright"):
+        assert removed not in html
+
+
+def test_clean_and_extract_drops_main_matching_ad_rule(clean_backend):
+    """主要内容区域本身命中清理规则时整体移除"""
+    html = markdown._clean_and_extract('<body><main class="sidebar"><p>x</p></main></body>')
+    
+    assert html == ""
+
+
+def test_page_to_markdown_stats_match_file(monkeypatch, tmp_path):
+    """写入文件的内容包含元数据，统计信息与文件内容一致"""
+    if not (markdown.USE_RUST_MD or markdown.USE_MARKDOWNIFY or markdown.USE_HTML2TEXT):
+        pytest.skip("需要至少一个 Markdown 转换库")
+    monkeypatch.setattr(markdown, "_html_cache", type(markdown._html_cache)())
+    manager_cls = type(markdown.browser_manager)
+    tab = SnapshotTab({"url": "https://a.example/", "title": "A", "origin": 1.0, "stamp": "s", "html": _PAGE_HTML})
+    monkeypatch.setattr(manager_cls, "ensure_browser", lambda self: True)
+    monkeypatch.setattr(manager_cls, "get_current_tab", lambda self: tab)
+    target = tmp_path / "docs" / "page.md"
+    
+    result = markdown.page_to_markdown(str(target))
+    
+    assert result["success"]
+    content = target.read_text(encoding="utf-8")
+    assert content.startswith("# A\n")
+    assert "Title" in content and "buy" not in content
+    assert "\n\n\n" not in content
+    assert result["stats"] == {
+        "lines": content.count("\n") + 1,
+        "characters": len(content),
+        "words": len(content.split()),
+    }
@@ -0,0 +1,64 @@
+"""MCP 服务器工具分发单元测试"""
+
+import asyncio
+import importlib
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+mcp_server = pytest.importorskip("mcp.server")
+if not hasattr(mcp_server.Server, "list_tools"):
+    pytest.skip("server.py 使用 mcp 1.x 的装饰器注册接口", allow_module_level=True)
+
+# server.py 使用包内相对导入，以项目目录作为包导入
+_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_ROOT.parent))
+server = importlib.import_module(f"{_ROOT.name}.server")
+
+
+def call(name, arguments):
+    """调用工具并解码返回的 JSON 结果"""
+    content, = asyncio.run(server.call_tool(name, arguments))
+    return json.loads(content.text)
+
+
+def test_every_tool_has_a_handler():
+    """工具列表与分发表一一对应，列表在导入时构建一次"""
+    names = [tool.name for tool in asyncio.run(server.list_tools())]
+    
+    assert len(names) == len(set(names))
+    assert set(names) == set(server._DISPATCH)
+    assert asyncio.run(server.list_tools()) is server._TOOLS_CACHE
+
+
+def test_unknown_tool_reports_error():
+    result = call("no_such_tool", {})
+    
+    assert result == {"success": False, "error": "未知的工具: no_such_tool"}
+
+
+def test_dispatch_fills_defaults_and_runs_on_tool_pool(monkeypatch):
+    """分发函数补齐可选参数，并在共用的工具线程中执行"""
+    seen = {}
+    
+    def click_element(**kwargs):
+        seen.update(kwargs, thread=threading.current_thread().name)
+        return {"success": True}
+    
+    monkeypatch.setattr(server.basic, "click_element", click_element)
+    
+    assert call("click_element", {"selector": "#go"}) == {"success": True}
+    assert seen.pop("thread").startswith("dp-mcp")
+    assert seen == {"selector": "#go", "selector_type": "css", "timeout": 10}
+
+
+def test_handler_exception_becomes_error_result(monkeypatch):
+    def boom(**kwargs):
+        raise RuntimeError("页面已关闭")
+    
+    monkeypatch.setattr(server.markdown, "get_page_content", boom)
+    
+    assert call("get_page_content", {}) == {"success": False, "error": "页面已关闭"}
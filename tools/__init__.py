@@ -10,12 +10,15 @@ from .basic import (
     wait_for_element,
     scroll_page,
     take_screenshot,
+    fsync_pending,
     execute_javascript,
+    batch_actions,
 )
 from .markdown import page_to_markdown
 from .advanced import (
     extract_table_data,
     smart_extract,
+    smart_extract_async,
     fill_form,
     handle_infinite_scroll,
     manage_cookies,
@@ -33,12 +36,15 @@ __all__ = [
     "wait_for_element",
     "scroll_page",
     "take_screenshot",
+    "fsync_pending",
     "execute_javascript",
+    "batch_actions",
     # Markdown 工具
     "page_to_markdown",
     # 高级工具
     "extract_table_data",
     "smart_extract",
+    "smart_extract_async",
     "fill_form",
     "handle_infinite_scroll",
     "manage_cookies",
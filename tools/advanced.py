@@ -3,23 +3,227 @@
 提供常见任务的高级封装，如表单填写、数据提取、懒加载处理等。
 """
 
+import asyncio
+import functools
 import logging
+import secrets
 import time
-import json
-import csv
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from pathlib import Path
 
 try:
-    from ..browser import browser_manager
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+try:
+    from ..browser import browser_manager, _TOOL_POOL
+    from .basic import _DP_LOC_PREFIXES, _fmt
 except ImportError:
     import sys
-    from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from browser import browser_manager
+    from browser import browser_manager, _TOOL_POOL
+    from tools.basic import _DP_LOC_PREFIXES, _fmt
 
 logger = logging.getLogger(__name__)
 
+# 在页面内读取表格，this 为表格元素，arguments: [include_header, 起始行, 结束行]
+# 结束行为 -1 时读取到末尾（run_js 的参数不支持 None），total 为数据行总数
+_TABLE_JS = """
+const [includeHeader, start, end] = arguments;
+const text = c => c.innerText.trim();
+const cellsByTag = (row, first, second) => {
+    const cells = [...row.cells];
+    const matched = cells.filter(c => c.tagName === first);
+    return matched.length ? matched : cells.filter(c => c.tagName === second);
+};
+const headerCells = row => cellsByTag(row, 'TH', 'TD');
+const dataCells = row => cellsByTag(row, 'TD', 'TH');
+let headers = [];
+let headerRow = null;
+if (this.tHead && this.tHead.rows.length) {
+    headers = headerCells(this.tHead.rows[0]).map(text);
+}
+if (!headers.length && this.rows.length) {
+    headerRow = this.rows[0];
+    headers = headerCells(headerRow).map(text);
+}
+let trs = this.tBodies.length ? [...this.tBodies[0].rows] : [...this.rows];
+// 跳过空行和已作为表头的首行，在分页前过滤，保证批次下标与 total 一致
+const skipHeader = headerRow && headers.length && includeHeader;
+trs = trs.filter(r => r.cells.length && !(skipHeader && r === headerRow));
+const rows = trs.slice(start, end < 0 ? undefined : end).map(r => dataCells(r).map(text));
+return {headers: headers, rows: rows, total: trs.length};
+"""
+
+# 写入 CSV 时每次从页面读取的行数，避免一次性把大表格全部载入内存
+_TABLE_BATCH_SIZE = 1000
+
+# CSV 导出文件的写缓冲大小（1 MiB），减少大表格写入时的系统调用次数
+_CSV_BUFFER_SIZE = 1 << 20
+
+# smart_extract 提取函数在页面中的注册名，每个进程随机生成，页面无法预先注册同名函数冒充
+_SMART_EXTRACT_KEY = f"dp-mcp.smartExtract.{secrets.token_hex(8)}"
+
+# 执行 smart_extract 的提取，arguments: [注册名, 容器选择器, {字段名: 子选择器}, 数量上限]
+# 当前文档尚未注册提取函数时先注册：按 (容器选择器, 字段) 的形状缓存已校验的字段列表，
+# 同一文档中重复提取同一形状时不再逐个校验子选择器。注册的属性不可写、不可重新定义。
+# 结果以 JSON 字符串返回：DrissionPage 解析对象数组时要为每个元素单独发起 CDP 请求
+_SMART_EXTRACT_JS = """
+const [key, sel, fields, limit] = arguments;
+const name = Symbol.for(key);
+if (!window[name]) {
+    const extractors = new Map();
+    const compile = (sel, fields) => {
+        // 每个子选择器只校验一次，无效的选择器在所有容器中都取 null
+        const probe = document.createDocumentFragment();
+        const entries = Object.entries(fields).map(([k, q]) => {
+            try {
+                probe.querySelector(q);
+                return [k, q];
+            } catch (err) {
+                return [k, null];
+            }
+        });
+        return limit => [...document.querySelectorAll(sel)].slice(0, limit).map(c => Object.fromEntries(
+            entries.map(([k, q]) => {
+                const e = q && c.querySelector(q);
+                if (!e) return [k, null];
+                if (e.tagName === 'IMG') return [k, e.src];
+                if (e.tagName === 'A') return [k, {text: e.innerText, href: e.href}];
+                return [k, (e.innerText ?? e.textContent ?? '').trim()];
+            })
+        ));
+    };
+    Object.defineProperty(window, name, {
+        value: (sel, fields, limit) => {
+            const shape = sel + '\\u0000' + JSON.stringify(fields);
+            let run = extractors.get(shape);
+            if (!run) {
+                run = compile(sel, fields);
+                extractors.set(shape, run);
+            }
+            return run(limit);
+        }
+    });
+}
+return JSON.stringify(window[name](sel, fields, limit));
+"""
+
+# 在页面内完成无限滚动，arguments: [最大滚动次数, 每次最长等待毫秒数, CSS 检查选择器或 null]
+# 每次滚动到底部后由 MutationObserver 等待新内容，元素数量（或页面高度）增长即进入下一次
+# 滚动；等满 pauseMs 仍无增长时停止
+_SCROLL_PUMP_JS = """
+const [maxScrolls, pauseMs, checkSelector] = arguments;
+const measure = () => checkSelector
+    ? document.querySelectorAll(checkSelector).length
+    : document.body.scrollHeight;
+const waitForGrowth = last => new Promise(resolve => {
+    const done = () => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(measure());
+    };
+    const observer = new MutationObserver(() => {
+        if (measure() > last) done();
+    });
+    const timer = setTimeout(done, pauseMs);
+    observer.observe(document.body, {childList: true, subtree: true});
+});
+return (async () => {
+    let last = measure();
+    let n = 0;
+    while (n < maxScrolls) {
+        window.scrollTo(0, document.body.scrollHeight);
+        n++;
+        const cur = await waitForGrowth(last);
+        if (cur === last) break;
+        last = cur;
+    }
+    return {scrolls: n, last: last};
+})();
+"""
+
+# 批量探测表单元素的标签、类型和选中状态，arguments 为 CSS 选择器，
+# 未找到或选择器无效时为 null；结果以 JSON 字符串返回，避免逐个解析数组元素
+_FORM_PROBE_JS = """
+return JSON.stringify([...arguments].map(sel => {
+    let e;
+    try {
+        e = document.querySelector(sel);
+    } catch (err) {
+        return null;
+    }
+    return e ? {
+        tag: e.tagName.toLowerCase(),
+        type: (e.type || '').toLowerCase(),
+        checked: !!e.checked
+    } : null;
+}));
+"""
+
+# 批量为文本框赋值并触发 input/change 事件，arguments[0].fields 为 [[选择器, 值], ...]
+# （run_js 的参数不支持列表，故包装在对象中传递）
+# 通过原型上的 value setter 赋值，使 React 等框架的受控组件也能感知变化；原型上没有 setter 时直接赋值
+_FORM_FILL_JS = """
+return arguments[0].fields.map(([sel, val]) => {
+    const e = document.querySelector(sel);
+    if (!e) return false;
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(e), 'value')?.set;
+    setter ? setter.call(e, val) : (e.value = val);
+    e.dispatchEvent(new Event('input', {bubbles: true}));
+    e.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+});
+"""
+
+# 需要真实点击或上传的 input 类型，不能直接赋值
+_INTERACTIVE_INPUT_TYPES = frozenset({'checkbox', 'radio', 'file'})
+
+# 标签页列表缓存，{id(browser): (过期时间, tabs)}；创建或关闭标签页后立即失效
+_tabs_cache: Dict[int, Tuple[float, List[Any]]] = {}
+_TABS_TTL = 0.05
+
+# DrissionPage 中表示 CSS 选择器的定位前缀，其余定位语法前缀无法交给 querySelector
+_CSS_PREFIXES = ('css:', 'css=', 'c:', 'c=')
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """将结果序列化为带缩进的 UTF-8 JSON，优先使用 orjson"""
+    if USE_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    import json
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads(data: str) -> Any:
+    """解析页面脚本以 JSON 字符串返回的结果，优先使用 orjson"""
+    if USE_ORJSON:
+        return orjson.loads(data)
+    import json
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=256)
+def _css_selector(selector: str) -> Optional[str]:
+    """将选择器转换为可在页面 JS 中使用的 CSS 选择器
+    
+    没有定位前缀的选择器视为 CSS，与 _fmt 为 DrissionPage 生成的定位字符串一致。
+    
+    Args:
+        selector: 选择器字符串，支持 'css:'/'c:' 等前缀
+    
+    Returns:
+        Optional[str]: CSS 选择器，使用 DrissionPage 专有语法时返回 None
+    """
+    for prefix in _CSS_PREFIXES:
+        if selector.startswith(prefix):
+            return selector[len(prefix):]
+    if selector.startswith(_DP_LOC_PREFIXES):
+        return None
+    return selector
+
 
 def extract_table_data(
     selector: str = "table",
@@ -53,53 +257,20 @@ def extract_table_data(
             }
         
         # 查找表格
-        table = tab.ele(selector, timeout=10)
+        table = tab.ele(_fmt("css", selector), timeout=10)
         if not table:
             return {
                 "success": False,
                 "error": f"未找到表格: {selector}"
             }
         
-        # 提取表头
-        headers = []
-        thead = table.ele('tag:thead', timeout=2)
-        if thead:
-            header_cells = thead.eles('tag:th')
-            if not header_cells:
-                header_cells = thead.eles('tag:td')
-            headers = [cell.text.strip() for cell in header_cells]
-        
-        # 如果没有 thead，尝试从第一行获取
-        if not headers:
-            first_row = table.ele('tag:tr', timeout=2)
-            if first_row:
-                cells = first_row.eles('tag:th')
-                if not cells:
-                    cells = first_row.eles('tag:td')
-                headers = [cell.text.strip() for cell in cells]
-        
-        # 提取数据行
-        rows = []
-        tbody = table.ele('tag:tbody', timeout=2)
-        if tbody:
-            tr_list = tbody.eles('tag:tr')
-        else:
-            tr_list = table.eles('tag:tr')
-            # 如果第一行是表头，跳过它
-            if headers and include_header and tr_list:
-                tr_list = tr_list[1:]
-        
-        for tr in tr_list:
-            cells = tr.eles('tag:td')
-            if not cells:
-                cells = tr.eles('tag:th')
-            
-            row_data = [cell.text.strip() for cell in cells]
-            if row_data:  # 跳过空行
-                rows.append(row_data)
-        
         # 格式化数据
         if format == "json":
+            # 在页面内一次性提取表头和所有行，避免逐个单元格往返
+            table_data = table.run_js(_TABLE_JS, include_header, 0, -1)
+            headers = table_data["headers"]
+            rows = table_data["rows"]
+            
             if headers:
                 # 使用表头作为键
                 data = [
@@ -120,8 +291,7 @@ def extract_table_data(
             if output_file:
                 path_obj = Path(output_file)
                 path_obj.parent.mkdir(parents=True, exist_ok=True)
-                with open(path_obj, 'w', encoding='utf-8') as f:
-                    json.dump(result_data, f, ensure_ascii=False, indent=2)
+                path_obj.write_bytes(_dumps_indented(result_data))
             
             return {
                 "success": True,
@@ -131,6 +301,9 @@ def extract_table_data(
             }
         
         elif format == "csv":
+            # 仅在导出 CSV 时导入 csv 模块，不拖慢工具模块的加载
+            import csv
+            
             # 保存为 CSV
             if not output_file:
                 output_file = "table_data.csv"
@@ -138,17 +311,28 @@ def extract_table_data(
             path_obj = Path(output_file)
             path_obj.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(path_obj, 'w', encoding='utf-8', newline='') as f:
+            # 分批读取并逐行写入，不在内存中保留整张表格
+            headers = []
+            row_count = 0
+            first_row_len = 0
+            with open(path_obj, 'w', encoding='utf-8', newline='', buffering=_CSV_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
-                if headers and include_header:
-                    writer.writerow(headers)
-                writer.writerows(rows)
+                for batch in _iter_table_batches(table, include_header):
+                    if not headers:
+                        headers = batch["headers"]
+                        if headers and include_header:
+                            writer.writerow(headers)
+                    for row in batch["rows"]:
+                        if not row_count:
+                            first_row_len = len(row)
+                        writer.writerow(row)
+                        row_count += 1
             
             return {
                 "success": True,
                 "format": "csv",
-                "row_count": len(rows),
-                "column_count": len(headers) if headers else (len(rows[0]) if rows else 0),
+                "row_count": row_count,
+                "column_count": len(headers) if headers else first_row_len,
                 "output_file": str(path_obj.absolute())
             }
         
@@ -159,13 +343,32 @@ def extract_table_data(
             }
         
     except Exception as e:
-        logger.error(f"提取表格数据失败: {str(e)}", exc_info=True)
+        logger.error("提取表格数据失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"提取表格数据失败: {str(e)}"
         }
 
 
+def _iter_table_batches(table, include_header: bool) -> Iterator[Dict[str, Any]]:
+    """分批读取表格数据
+    
+    Args:
+        table: 表格元素
+        include_header: 是否包含表头
+    
+    Yields:
+        Dict[str, Any]: 每批的 headers、rows 和数据行总数 total
+    """
+    start = 0
+    while True:
+        batch = table.run_js(_TABLE_JS, include_header, start, start + _TABLE_BATCH_SIZE)
+        yield batch
+        start += _TABLE_BATCH_SIZE
+        if start >= batch["total"]:
+            break
+
+
 def smart_extract(
     selector: str,
     fields: Dict[str, str],
@@ -173,7 +376,8 @@ def smart_extract(
 ) -> Dict[str, Any]:
     """智能数据抓取
     
-    根据选择器提取多个元素的结构化数据。
+    根据选择器提取多个元素的结构化数据。选择器均为 CSS 时在页面内一次性
+    完成提取；包含 DrissionPage 专有语法（如 'xpath:'、'@'）时逐个元素提取。
     
     Args:
         selector: 容器元素选择器（匹配多个项）
@@ -207,44 +411,24 @@ def smart_extract(
                 "error": "没有可用的标签页"
             }
         
-        # 查找所有匹配的容器
-        containers = tab.eles(selector, timeout=10)
+        css = _css_selector(selector)
+        css_fields = {name: _css_selector(sel) for name, sel in fields.items()}
         
-        if not containers:
+        if css is not None and None not in css_fields.values():
+            # 所有选择器都是 CSS：在页面内一次性完成提取
+            results = _run_smart_extract(tab, css, css_fields, limit)
+            if not results and tab.ele(f"css:{css}", timeout=10):
+                # 容器尚未加载完成，等待出现后重试一次
+                results = _run_smart_extract(tab, css, css_fields, limit)
+        else:
+            results = _smart_extract_eles(tab, selector, fields, limit)
+        
+        if not results:
             return {
                 "success": False,
                 "error": f"未找到匹配的元素: {selector}"
             }
         
-        # 限制数量
-        containers = containers[:limit]
-        
-        # 提取数据
-        results = []
-        for container in containers:
-            item = {}
-            for field_name, field_selector in fields.items():
-                try:
-                    element = container.ele(field_selector, timeout=2)
-                    if element:
-                        # 尝试获取不同类型的内容
-                        if element.tag == 'img':
-                            item[field_name] = element.attr('src')
-                        elif element.tag == 'a':
-                            item[field_name] = {
-                                "text": element.text,
-                                "href": element.attr('href')
-                            }
-                        else:
-                            item[field_name] = element.text.strip()
-                    else:
-                        item[field_name] = None
-                except Exception as e:
-                    logger.warning(f"提取字段 {field_name} 失败: {str(e)}")
-                    item[field_name] = None
-            
-            results.append(item)
-        
         return {
             "success": True,
             "count": len(results),
@@ -253,13 +437,91 @@ def smart_extract(
         }
         
     except Exception as e:
-        logger.error(f"智能提取失败: {str(e)}", exc_info=True)
+        logger.error("智能提取失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"智能提取失败: {str(e)}"
         }
 
 
+def _run_smart_extract(
+    tab,
+    css: str,
+    css_fields: Dict[str, str],
+    limit: int
+) -> List[Dict[str, Any]]:
+    """在页面内执行 smart_extract 的提取
+    
+    提取函数只在用到时注册到当前文档，不为标签页添加初始化脚本；同一文档中的后续
+    提取直接复用已注册的函数。
+    """
+    return _loads(tab.run_js(_SMART_EXTRACT_JS, _SMART_EXTRACT_KEY, css, css_fields, limit))
+
+
+def _smart_extract_eles(
+    tab,
+    selector: str,
+    fields: Dict[str, str],
+    limit: int
+) -> List[Dict[str, Any]]:
+    """逐个元素提取字段，用于包含 DrissionPage 专有语法的选择器
+    
+    同一标签页的 CDP 命令共用一个连接，不能从多个线程并发发送，因此按容器顺序依次提取。
+    
+    Args:
+        tab: 标签页对象
+        selector: 容器元素选择器
+        fields: 字段映射，{字段名: 子选择器}
+        limit: 最多提取的项数
+    
+    Returns:
+        List[Dict[str, Any]]: 提取的数据，未找到容器时为空列表
+    """
+    containers = tab.eles(_fmt("css", selector), timeout=10)[:limit]
+    return [_extract_container(container, fields) for container in containers]
+
+
+def _extract_container(container, fields: Dict[str, str]) -> Dict[str, Any]:
+    """从单个容器元素中提取各字段"""
+    item = {}
+    for field_name, field_selector in fields.items():
+        try:
+            element = container.ele(_fmt("css", field_selector), timeout=2)
+            if element:
+                # 尝试获取不同类型的内容
+                if element.tag == 'img':
+                    item[field_name] = element.attr('src')
+                elif element.tag == 'a':
+                    item[field_name] = {
+                        "text": element.text,
+                        "href": element.attr('href')
+                    }
+                else:
+                    item[field_name] = element.text.strip()
+            else:
+                item[field_name] = None
+        except Exception as e:
+            logger.warning("提取字段 %s 失败: %s", field_name, e)
+            item[field_name] = None
+    
+    return item
+
+
+async def smart_extract_async(
+    selector: str,
+    fields: Dict[str, str],
+    limit: int = 100
+) -> Dict[str, Any]:
+    """smart_extract 的异步版本
+    
+    在与 MCP 工具调用共用的单线程执行器中执行 smart_extract，不阻塞事件循环；
+    多次调用按提交顺序依次执行，不会从多个线程同时驱动同一标签页。
+    参数与返回值同 smart_extract。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_TOOL_POOL, smart_extract, selector, fields, limit)
+
+
 def fill_form(
     fields: Dict[str, Any],
     submit_selector: Optional[str] = None,
@@ -299,30 +561,63 @@ def fill_form(
                 "error": "没有可用的标签页"
             }
         
-        filled_fields = []
+        filled = set()
         errors = []
         
-        # 填写每个字段
-        for selector, value in fields.items():
+        # 一次往返探测所有 CSS 选择器对应元素的标签和类型
+        css_map = {selector: _css_selector(selector) for selector in fields}
+        css_list = [css for css in css_map.values() if css is not None]
+        probed = dict(zip(css_list, _loads(tab.run_js(_FORM_PROBE_JS, *css_list)))) if css_list else {}
+        
+        # 普通文本框在页面内批量赋值，其余字段（复选框、下拉框、未找到的元素等）逐个处理
+        batch = []
+        pending = []
+        for selector in fields:
+            info = probed.get(css_map[selector])
+            if info and (
+                info["tag"] == "textarea"
+                or (info["tag"] == "input" and info["type"] not in _INTERACTIVE_INPUT_TYPES)
+            ):
+                batch.append(selector)
+            else:
+                pending.append(selector)
+        
+        if batch:
+            done = tab.run_js(
+                _FORM_FILL_JS,
+                {"fields": [[css_map[selector], str(fields[selector])] for selector in batch]}
+            )
+            for selector, ok in zip(batch, done):
+                if ok:
+                    filled.add(selector)
+                else:
+                    pending.append(selector)
+        
+        # 逐个填写剩余字段；无前缀的选择器按 CSS 定位，与页面内探测的语义一致
+        for selector in pending:
+            value = fields[selector]
             try:
-                element = tab.ele(selector, timeout=10)
+                element = tab.ele(_fmt("css", selector), timeout=10)
                 if not element:
                     errors.append(f"未找到元素: {selector}")
                     continue
                 
-                tag = element.tag.lower()
-                input_type = (element.attr('type') or '').lower()
+                # 已探测过的元素直接使用探测结果，不再逐项查询
+                info = probed.get(css_map[selector])
+                if info:
+                    tag = info["tag"]
+                    input_type = info["type"]
+                else:
+                    tag = element.tag.lower()
+                    input_type = (element.attr('type') or '').lower()
                 
                 # 根据元素类型处理
                 if tag == 'input':
                     if input_type in ['checkbox', 'radio']:
-                        # 复选框和单选框
-                        if value:
-                            if not element.states.is_checked:
-                                element.click()
-                        else:
-                            if element.states.is_checked:
-                                element.click()
+                        # 复选框和单选框，状态与目标值不一致时才点击
+                        checked = info["checked"] if info else element.states.is_checked
+                        if bool(value) != checked:
+                            element.click()
                     else:
                         # 文本输入框
                         element.clear()
@@ -342,17 +637,20 @@ def fill_form(
                     element.clear()
                     element.input(str(value))
                 
-                filled_fields.append(selector)
+                filled.add(selector)
                 
             except Exception as e:
-                logger.warning(f"填写字段 {selector} 失败: {str(e)}")
+                logger.warning("填写字段 %s 失败: %s", selector, e)
                 errors.append(f"{selector}: {str(e)}")
         
+        # 按传入顺序返回已填写的字段
+        filled_fields = [selector for selector in fields if selector in filled]
+        
         # 提交表单
         submitted = False
         if submit_selector:
             try:
-                submit_btn = tab.ele(submit_selector, timeout=10)
+                submit_btn = tab.ele(_fmt("css", submit_selector), timeout=10)
                 if submit_btn:
                     submit_btn.click()
                     time.sleep(wait_after_submit)
@@ -371,7 +669,7 @@ def fill_form(
         }
         
     except Exception as e:
-        logger.error(f"填写表单失败: {str(e)}", exc_info=True)
+        logger.error("填写表单失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"填写表单失败: {str(e)}"
@@ -385,11 +683,13 @@ def handle_infinite_scroll(
 ) -> Dict[str, Any]:
     """处理无限滚动/懒加载
     
-    自动滚动页面直到内容不再增加。
+    自动滚动页面直到内容不再增加。滚动循环在页面内执行，只需一次往返，
+    检测到新内容后立即进入下一次滚动；check_selector 使用 DrissionPage
+    专有语法时逐次滚动检查。
     
     Args:
         max_scrolls: 最大滚动次数，默认 10
-        scroll_pause: 每次滚动后的等待时间（秒），默认 2
+        scroll_pause: 每次滚动后等待新内容的最长时间（秒），默认 2
         check_selector: 用于检查新内容的选择器（可选）
     
     Returns:
@@ -409,55 +709,80 @@ def handle_infinite_scroll(
                 "error": "没有可用的标签页"
             }
         
-        scroll_count = 0
-        last_height = 0
-        last_count = 0
-        
-        for i in range(max_scrolls):
-            # 滚动到底部
-            tab.scroll.to_bottom()
-            scroll_count += 1
-            
-            # 等待内容加载
-            time.sleep(scroll_pause)
-            
-            # 检查是否有新内容
-            if check_selector:
-                # 通过元素数量检查
-                elements = tab.eles(check_selector, timeout=2)
-                current_count = len(elements) if elements else 0
-                
-                if current_count == last_count:
-                    # 没有新内容，停止滚动
-                    break
-                
-                last_count = current_count
-            else:
-                # 通过页面高度检查
-                current_height = tab.run_js('return document.body.scrollHeight')
-                
-                if current_height == last_height:
-                    # 页面高度没变，停止滚动
-                    break
-                
-                last_height = current_height
+        css = _css_selector(check_selector) if check_selector else None
+        if check_selector and css is None:
+            scroll_count, last_value = _infinite_scroll_eles(
+                tab, max_scrolls, scroll_pause, check_selector
+            )
+        else:
+            # 整个滚动循环在页面内完成，只需一次往返
+            pump = tab.run_js(
+                _SCROLL_PUMP_JS,
+                max_scrolls,
+                int(scroll_pause * 1000),
+                css or "",
+                timeout=max_scrolls * scroll_pause + 10
+            )
+            scroll_count = pump["scrolls"]
+            last_value = pump["last"]
         
         return {
             "success": True,
             "scroll_count": scroll_count,
-            "final_count": last_count if check_selector else None,
-            "final_height": last_height if not check_selector else None,
+            "final_count": last_value if check_selector else None,
+            "final_height": last_value if not check_selector else None,
             "message": f"完成 {scroll_count} 次滚动"
         }
         
     except Exception as e:
-        logger.error(f"处理无限滚动失败: {str(e)}", exc_info=True)
+        logger.error("处理无限滚动失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"处理无限滚动失败: {str(e)}"
         }
 
 
+def _infinite_scroll_eles(
+    tab,
+    max_scrolls: int,
+    scroll_pause: float,
+    check_selector: str
+) -> Tuple[int, int]:
+    """逐次滚动并用 DrissionPage 检查元素数量，用于非 CSS 的检查选择器
+    
+    Args:
+        tab: 标签页对象
+        max_scrolls: 最大滚动次数
+        scroll_pause: 每次滚动后的等待时间（秒）
+        check_selector: 用于检查新内容的选择器
+    
+    Returns:
+        Tuple[int, int]: 滚动次数和最后一次的元素数量
+    """
+    scroll_count = 0
+    last_count = 0
+    
+    for i in range(max_scrolls):
+        # 滚动到底部
+        tab.scroll.to_bottom()
+        scroll_count += 1
+        
+        # 等待内容加载
+        time.sleep(scroll_pause)
+        
+        # 通过元素数量检查是否有新内容
+        elements = tab.eles(_fmt("css", check_selector), timeout=2)
+        current_count = len(elements) if elements else 0
+        
+        if current_count == last_count:
+            # 没有新内容，停止滚动
+            break
+        
+        last_count = current_count
+    
+    return scroll_count, last_count
+
+
 def manage_cookies(
     action: str,
     name: Optional[str] = None,
@@ -490,9 +815,13 @@ def manage_cookies(
             }
         
         if action == "get":
+            cookies = _get_cookies(tab)
             if name:
                 # 获取特定 Cookie
-                cookie = tab.cookies(name)
+                cookie = next(
+                    (c["value"] for c in cookies if c["name"] == name),
+                    None
+                )
                 return {
                     "success": True,
                     "action": "get",
@@ -501,12 +830,11 @@ def manage_cookies(
                 }
             else:
                 # 获取所有 Cookies
-                cookies = tab.cookies()
                 return {
                     "success": True,
                     "action": "get",
                     "cookies": cookies,
-                    "count": len(cookies) if cookies else 0
+                    "count": len(cookies)
                 }
         
         elif action == "set":
@@ -560,13 +888,25 @@ def manage_cookies(
             }
         
     except Exception as e:
-        logger.error(f"Cookie 管理失败: {str(e)}", exc_info=True)
+        logger.error("Cookie 管理失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"Cookie 管理失败: {str(e)}"
         }
 
 
+def _get_cookies(tab) -> List[Dict[str, Any]]:
+    """通过一次 CDP 调用读取当前页面的 Cookies
+    
+    页面脚本和网络请求随时可能修改 Cookies，每次都重新读取，不做缓存。
+    """
+    raw = tab.run_cdp('Network.getCookies')['cookies']
+    return [
+        {"name": c["name"], "value": c["value"], "domain": c.get("domain")}
+        for c in raw
+    ]
+
+
 def switch_to_tab(
     action: str,
     url: Optional[str] = None,
@@ -598,9 +938,15 @@ def switch_to_tab(
                 "error": "浏览器未初始化"
             }
         
+        # 整个调用期间只解析一次当前标签页
+        current_tab = browser_manager.get_current_tab()
+        
         if action == "new":
-            # 创建新标签页
-            new_tab = browser.new_tab(url or "about:blank")
+            # 优先复用已回收的标签页（仅无头模式），没有时才创建新标签页
+            new_tab = _take_pooled_tab(browser, url)
+            if new_tab is None:
+                new_tab = browser.new_tab(url or "about:blank")
+                _tabs_cache.clear()
             browser_manager.set_current_tab(new_tab)
             
             return {
@@ -613,10 +959,7 @@ def switch_to_tab(
         
         elif action == "switch":
             # 切换标签页
-            try:
-                tabs = browser.get_tabs() if hasattr(browser, 'get_tabs') else [browser_manager.get_current_tab()]
-            except:
-                tabs = [browser_manager.get_current_tab()]
+            tabs = _visible_tabs(browser, current_tab)
             
             if index is not None:
                 # 按索引切换
@@ -676,18 +1019,13 @@ def switch_to_tab(
         
         elif action == "close":
             # 关闭标签页
-            current_tab = browser_manager.get_current_tab()
-            
             if index is not None:
-                try:
-                    tabs = browser.get_tabs() if hasattr(browser, 'get_tabs') else [current_tab]
-                except:
-                    tabs = [current_tab]
+                tabs = _visible_tabs(browser, current_tab)
                 if 0 <= index < len(tabs):
-                    tabs[index].close()
+                    _release_tab(tabs[index])
                     # 如果关闭的是当前标签页，切换到最新的
                     if tabs[index] == current_tab:
-                        browser_manager.set_current_tab(browser.latest_tab)
+                        browser_manager.set_current_tab(_latest_visible_tab(browser))
                     return {
                         "success": True,
                         "action": "close",
@@ -702,8 +1040,8 @@ def switch_to_tab(
             else:
                 # 关闭当前标签页
                 if current_tab:
-                    current_tab.close()
-                    browser_manager.set_current_tab(browser.latest_tab)
+                    _release_tab(current_tab)
+                    browser_manager.set_current_tab(_latest_visible_tab(browser))
                     return {
                         "success": True,
                         "action": "close",
@@ -717,20 +1055,19 @@ def switch_to_tab(
         
         elif action == "list":
             # 列出所有标签页
-            try:
-                tabs = browser.get_tabs() if hasattr(browser, 'get_tabs') else [browser_manager.get_current_tab()]
-            except:
-                tabs = [browser_manager.get_current_tab()]
+            tabs = _visible_tabs(browser, current_tab)
             
-            tab_list = [
-                {
+            # 一次 CDP 调用取回所有标签页的 URL 和标题，取不到时再逐个读取
+            infos = _target_infos(current_tab)
+            tab_list = []
+            for i, tab in enumerate(tabs):
+                info = infos.get(tab.tab_id)
+                tab_list.append({
                     "index": i,
-                    "url": tab.url,
-                    "title": tab.title,
-                    "is_current": tab == browser_manager.get_current_tab()
-                }
-                for i, tab in enumerate(tabs)
-            ]
+                    "url": info["url"] if info else tab.url,
+                    "title": info["title"] if info else tab.title,
+                    "is_current": tab == current_tab
+                })
             
             return {
                 "success": True,
@@ -746,9 +1083,92 @@ def switch_to_tab(
             }
         
     except Exception as e:
-        logger.error(f"Tab 管理失败: {str(e)}", exc_info=True)
+        logger.error("Tab 管理失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"Tab 管理失败: {str(e)}"
         }
 
+
+def _get_tabs(browser) -> List[Any]:
+    """获取浏览器的全部标签页，结果缓存 _TABS_TTL 秒
+    
+    同一次调用中多次获取标签页列表时（如关闭后选择新的当前标签页）只请求一次；
+    创建或真正关闭标签页后缓存立即失效。
+    """
+    key = id(browser)
+    cached = _tabs_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    tabs = browser.get_tabs()
+    _tabs_cache.clear()
+    _tabs_cache[key] = (now + _TABS_TTL, tabs)
+    return tabs
+
+
+def _visible_tabs(browser, current_tab) -> List[Any]:
+    """获取浏览器的标签页列表，排除已回收待复用的标签页"""
+    try:
+        tabs = _get_tabs(browser) if hasattr(browser, 'get_tabs') else [current_tab]
+    except Exception:
+        tabs = [current_tab]
+    
+    pooled = browser_manager.parked_tab_ids()
+    if not pooled:
+        return tabs
+    return [tab for tab in tabs if getattr(tab, 'tab_id', None) not in pooled]
+
+
+def _target_infos(tab) -> Dict[str, Dict[str, Any]]:
+    """通过 Target.getTargets 一次获取所有页面的信息
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: {标签页 ID: targetInfo}，获取失败时为空字典
+    """
+    if tab is None:
+        return {}
+    try:
+        targets = tab.run_cdp('Target.getTargets')['targetInfos']
+    except Exception as e:
+        logger.debug("批量获取标签页信息失败: %s", e)
+        return {}
+    return {t["targetId"]: t for t in targets if t.get("type") == "page"}
+
+
+def _latest_visible_tab(browser):
+    """获取最新的可见标签页，没有时取回一个已回收的标签页"""
+    tabs = _visible_tabs(browser, None)
+    if tabs and tabs[0] is not None:
+        return tabs[0]
+    return _take_pooled_tab(browser, None) or browser.latest_tab
+
+
+def _take_pooled_tab(browser, url: Optional[str]):
+    """取出当前浏览器已回收的标签页并导航到 url
+    
+    Returns:
+        标签页对象，没有可复用的标签页时返回 None
+    """
+    while True:
+        tab = browser_manager.take_parked_tab()
+        if tab is None:
+            return None
+        try:
+            if url:
+                tab.get(url)
+            if hasattr(browser, 'activate_tab'):
+                browser.activate_tab(tab)
+            return tab
+        except Exception as e:
+            # 标签页已失效（如被用户手动关闭），丢弃后继续查找
+            logger.debug("丢弃失效的回收标签页: %s", e)
+
+
+def _release_tab(tab) -> None:
+    """关闭标签页：无头模式下交给浏览器管理器回收复用，否则真正关闭"""
+    if browser_manager.park_tab(tab):
+        return
+    tab.close()
+    _tabs_cache.clear()
@@ -3,10 +3,13 @@
 提供细粒度的浏览器控制操作，包括导航、元素查找、点击、输入等。
 """
 
+import functools
+import json
 import logging
+import os
 import time
-from typing import Dict, Any, Optional, List, Union
-from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, IO, Optional, List, Set, Tuple, Union
 
 try:
     from ..browser import browser_manager
@@ -18,6 +21,240 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# DOM 连续无变化多久（毫秒）视为已稳定
+_SETTLE_QUIET_MS = 100
+
+# 在页面内等待 DOM 稳定，arguments: [最长等待毫秒数, 静默毫秒数]
+# 出现变化后开始计算静默时间，静默期内无新变化即返回；始终不超过最长等待时间
+_SETTLE_JS = """
+const [maxMs, quietMs] = arguments;
+return new Promise(resolve => {
+    let quiet = null;
+    const done = () => {
+        observer.disconnect();
+        clearTimeout(quiet);
+        clearTimeout(cap);
+        resolve(true);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quiet);
+        quiet = setTimeout(done, quietMs);
+    });
+    const cap = setTimeout(done, maxMs);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+});
+"""
+
+# 截图文件后缀对应的图片格式，其他路径仍交给 DrissionPage 自行命名保存
+_SCREENSHOT_FORMATS = {'.png': 'png', '.jpg': 'jpg', '.jpeg': 'jpeg', '.webp': 'webp'}
+
+# 后台写入截图文件的线程池（单线程，按提交顺序落盘），磁盘写入与下一次 CDP 调用重叠执行
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dp-io")
+_pending_writes: List[Future] = []
+
+# 已确认存在的目录，重复写入同一目录时不再调用 makedirs
+_MKDIR_CACHE: Set[str] = set()
+
+# 选择器类型对应的 DrissionPage 定位前缀；CSS 选择器需要显式加 css: 前缀，
+# 否则 DrissionPage 会把 "div.item" 这类字符串当作文本模糊查找
+_SELECTOR_PREFIX = {"css": "css:", "xpath": "xpath:", "text": "text:"}
+
+# 已带 DrissionPage 定位语法前缀的选择器，以 css 类型传入时原样使用
+_DP_LOC_PREFIXES = (
+    'css:', 'css=', 'c:', 'c=', 'xpath:', 'xpath=', 'x:', 'x=',
+    'tag:', 'tag=', 't:', 't=', 'text:', 'text=', 'text^', 'text$',
+    'tx:', 'tx=', 'tx^', 'tx$', '@'
+)
+
+# 在页面内按顺序执行一批操作，arguments[0]: {actions, waitMs, stopOnError}
+# （run_js 的参数不支持列表，故包装在对象中传递）
+# 每个操作为 [action, selector, selector_type, text, clear_first]，以 JSON 字符串返回每个操作的结果
+_BATCH_ACTIONS_JS = """
+const {actions, waitMs, stopOnError} = arguments[0];
+const byText = text => {
+    const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        if (node.nodeValue.includes(text)) return node.parentElement;
+    }
+    return null;
+};
+const lookup = (selector, type) => {
+    if (type === 'xpath') {
+        return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return type === 'text' ? byText(selector) : document.querySelector(selector);
+};
+const find = async (selector, type) => {
+    const deadline = performance.now() + waitMs;
+    let el = lookup(selector, type);
+    while (!el && performance.now() < deadline) {
+        await new Promise(r => setTimeout(r, 50));
+        el = lookup(selector, type);
+    }
+    return el;
+};
+const results = [];
+for (const [action, selector, type, text, clearFirst] of actions) {
+    const result = {action, selector, success: false};
+    results.push(result);
+    try {
+        const el = await find(selector, type);
+        if (!el) {
+            result.error = '未找到元素: ' + selector;
+        } else if (action === 'click') {
+            el.scrollIntoView({block: 'center'});
+            el.click();
+            result.success = true;
+        } else if (action === 'input') {
+            el.focus();
+            if ('value' in el) {
+                const value = (clearFirst ? '' : el.value) + text;
+                const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value')?.set;
+                setter ? setter.call(el, value) : (el.value = value);
+            } else {
+                el.textContent = (clearFirst ? '' : el.textContent) + text;
+            }
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            result.success = true;
+        } else {
+            result.text = el.innerText ?? el.textContent;
+            result.tag = el.localName;
+            result.success = true;
+        }
+    } catch (e) {
+        result.error = String(e);
+    }
+    if (!result.success && stopOnError) break;
+}
+return JSON.stringify(results);
+"""
+
+# batch_actions 支持的操作类型
+_BATCH_ACTIONS = ("click", "input", "get_text")
+
+# batch_actions 页面脚本能直接执行的定位前缀及对应的选择器类型；其余 DrissionPage
+# 语法（如 '@id=x'、'text='、'tag:'）逐个通过 DrissionPage 执行
+_BATCH_JS_PREFIXES = (
+    ('css:', 'css'), ('css=', 'css'), ('c:', 'css'), ('c=', 'css'),
+    ('xpath:', 'xpath'), ('xpath=', 'xpath'), ('x:', 'xpath'), ('x=', 'xpath'),
+    ('text:', 'text'), ('tx:', 'text'),
+)
+
+# 批量读取元素信息，arguments 为元素对象；结果以 JSON 字符串返回，避免逐个解析数组元素
+_ELEMENTS_INFO_JS = """
+return JSON.stringify([...arguments].map(e => ({
+    tag: e.localName,
+    text: e.innerText ?? e.textContent,
+    attrs: Object.fromEntries([...e.attributes].map(a => [a.name, a.value]))
+})));
+"""
+
+# 在页面内等待元素出现，arguments: [选择器类型('css'/'xpath'), 选择器, 超时毫秒数]
+# 由 MutationObserver 在 DOM 变化时重新查找，找到时返回元素的标签和文本，超时返回 null
+_WAIT_ELEMENT_JS = """
+const [type, selector, timeoutMs] = arguments;
+const find = () => type === 'xpath'
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+const info = e => ({tag: e.localName, text: e.innerText ?? e.textContent});
+const found = find();
+if (found) return info(found);
+return new Promise(resolve => {
+    const done = e => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(e ? info(e) : null);
+    };
+    const observer = new MutationObserver(() => {
+        const e = find();
+        if (e) done(e);
+    });
+    const timer = setTimeout(() => done(null), timeoutMs);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+});
+"""
+
+
+def _get_tab() -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """确保浏览器可用并获取当前标签页
+    
+    Returns:
+        Tuple[Any, Optional[Dict[str, Any]]]: (标签页, None)，失败时为 (None, 错误结果)
+    """
+    if not browser_manager.ensure_browser():
+        return None, {
+            "success": False,
+            "error": "无法初始化浏览器"
+        }
+    
+    tab = browser_manager.get_current_tab()
+    if tab is None:
+        return None, {
+            "success": False,
+            "error": "没有可用的标签页"
+        }
+    return tab, None
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt(selector_type: str, selector: str) -> Optional[str]:
+    """将选择器格式化为 DrissionPage 定位字符串，结果缓存以便重复调用时直接复用
+    
+    Args:
+        selector_type: 选择器类型，'css', 'xpath', 'text'
+        selector: 选择器字符串
+    
+    Returns:
+        Optional[str]: 定位字符串，选择器类型不支持时返回 None
+    """
+    prefix = _SELECTOR_PREFIX.get(selector_type)
+    if prefix is None:
+        return None
+    if selector_type == "css" and selector.startswith(_DP_LOC_PREFIXES):
+        return selector
+    return prefix + selector
+
+
+def _wait_dom_settled(tab, max_wait: float) -> None:
+    """等待操作引起的页面变化稳定下来
+    
+    Args:
+        tab: 标签页对象
+        max_wait: 最长等待时间（秒）
+    """
+    try:
+        tab.run_js(_SETTLE_JS, int(max_wait * 1000), _SETTLE_QUIET_MS, timeout=max_wait + 5)
+    except Exception as e:
+        # 操作触发了页面跳转时脚本上下文会被销毁，改为等待新文档加载
+        logger.debug("等待页面稳定失败: %s", e)
+        tab.wait.doc_loaded(timeout=max_wait)
+
+
+def _elements_info(tab, elements: List[Any]) -> List[Dict[str, Any]]:
+    """一次往返读取多个元素的标签、文本和属性
+    
+    Args:
+        tab: 标签页对象
+        elements: 元素对象列表
+    
+    Returns:
+        List[Dict[str, Any]]: 每个元素的 tag、text、attrs
+    """
+    try:
+        return json.loads(tab.run_js(_ELEMENTS_INFO_JS, *elements))
+    except Exception as e:
+        # 元素已失效等情况下逐个读取
+        logger.debug("批量读取元素信息失败: %s", e)
+        return [
+            {
+                "tag": el.tag,
+                "text": el.text,
+                "attrs": el.attrs
+            }
+            for el in elements
+        ]
+
 
 def navigate(url: str, timeout: int = 30) -> Dict[str, Any]:
     """导航到指定 URL
@@ -30,24 +267,15 @@ def navigate(url: str, timeout: int = 30) -> Dict[str, Any]:
         Dict[str, Any]: 操作结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 导航到 URL
         tab.get(url, timeout=timeout)
         
-        # 等待页面加载
-        time.sleep(1)
+        # 等待文档加载完成，已加载时立即返回
+        tab.wait.doc_loaded(timeout=timeout)
         
         return {
             "success": True,
@@ -57,7 +285,7 @@ def navigate(url: str, timeout: int = 30) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"导航失败: {str(e)}", exc_info=True)
+        logger.error("导航失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"导航失败: {str(e)}"
@@ -82,41 +310,23 @@ def find_elements(
         Dict[str, Any]: 包含找到的元素信息
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 根据选择器类型查找元素
-        if selector_type == "css":
-            if single:
-                element = tab.ele(selector, timeout=timeout)
-            else:
-                element = tab.eles(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            if single:
-                element = tab.ele(f"xpath:{selector}", timeout=timeout)
-            else:
-                element = tab.eles(f"xpath:{selector}", timeout=timeout)
-        elif selector_type == "text":
-            if single:
-                element = tab.ele(f"text:{selector}", timeout=timeout)
-            else:
-                element = tab.eles(f"text:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
         
+        if single:
+            element = tab.ele(locator, timeout=timeout)
+        else:
+            element = tab.eles(locator, timeout=timeout)
+        
         # 处理结果
         if single:
             if element:
@@ -124,11 +334,7 @@ def find_elements(
                     "success": True,
                     "found": True,
                     "count": 1,
-                    "element": {
-                        "tag": element.tag,
-                        "text": element.text,
-                        "attrs": element.attrs
-                    }
+                    "element": _elements_info(tab, [element])[0]
                 }
             else:
                 return {
@@ -139,14 +345,7 @@ def find_elements(
                 }
         else:
             if element:
-                elements_info = [
-                    {
-                        "tag": el.tag,
-                        "text": el.text,
-                        "attrs": el.attrs
-                    }
-                    for el in element[:10]  # 限制返回前 10 个元素
-                ]
+                elements_info = _elements_info(tab, element[:10])  # 限制返回前 10 个元素
                 return {
                     "success": True,
                     "found": True,
@@ -163,7 +362,7 @@ def find_elements(
                 }
         
     except Exception as e:
-        logger.error(f"查找元素失败: {str(e)}", exc_info=True)
+        logger.error("查找元素失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"查找元素失败: {str(e)}"
@@ -182,37 +381,24 @@ def click_element(
         selector: 选择器字符串
         selector_type: 选择器类型，支持 'css', 'xpath', 'text'，默认 'css'
         timeout: 等待元素出现的超时时间（秒），默认 10
-        wait_after: 点击后等待时间（秒），默认 1
+        wait_after: 点击后最长等待时间（秒），页面变化停止后提前返回，默认 1
     
     Returns:
         Dict[str, Any]: 操作结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 查找元素
-        if selector_type == "css":
-            element = tab.ele(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            element = tab.ele(f"xpath:{selector}", timeout=timeout)
-        elif selector_type == "text":
-            element = tab.ele(f"text:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
+        element = tab.ele(locator, timeout=timeout)
         
         if not element:
             return {
@@ -223,9 +409,9 @@ def click_element(
         # 点击元素
         element.click()
         
-        # 等待
+        # 等待页面变化稳定，最长 wait_after 秒
         if wait_after > 0:
-            time.sleep(wait_after)
+            _wait_dom_settled(tab, wait_after)
         
         return {
             "success": True,
@@ -237,7 +423,7 @@ def click_element(
         }
         
     except Exception as e:
-        logger.error(f"点击元素失败: {str(e)}", exc_info=True)
+        logger.error("点击元素失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"点击元素失败: {str(e)}"
@@ -256,7 +442,7 @@ def input_text(
     Args:
         selector: 选择器字符串
         text: 要输入的文本
-        selector_type: 选择器类型，支持 'css', 'xpath'，默认 'css'
+        selector_type: 选择器类型，支持 'css', 'xpath', 'text'，默认 'css'
         clear_first: 是否先清空原有内容，默认 True
         timeout: 等待元素出现的超时时间（秒），默认 10
     
@@ -264,29 +450,18 @@ def input_text(
         Dict[str, Any]: 操作结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 查找元素
-        if selector_type == "css":
-            element = tab.ele(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            element = tab.ele(f"xpath:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
+        element = tab.ele(locator, timeout=timeout)
         
         if not element:
             return {
@@ -307,7 +482,7 @@ def input_text(
         }
         
     except Exception as e:
-        logger.error(f"输入文本失败: {str(e)}", exc_info=True)
+        logger.error("输入文本失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"输入文本失败: {str(e)}"
@@ -323,36 +498,25 @@ def get_element_text(
     
     Args:
         selector: 选择器字符串
-        selector_type: 选择器类型，支持 'css', 'xpath'，默认 'css'
+        selector_type: 选择器类型，支持 'css', 'xpath', 'text'，默认 'css'
         timeout: 等待元素出现的超时时间（秒），默认 10
     
     Returns:
         Dict[str, Any]: 包含元素文本的结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 查找元素
-        if selector_type == "css":
-            element = tab.ele(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            element = tab.ele(f"xpath:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
+        element = tab.ele(locator, timeout=timeout)
         
         if not element:
             return {
@@ -367,7 +531,7 @@ def get_element_text(
         }
         
     except Exception as e:
-        logger.error(f"获取元素文本失败: {str(e)}", exc_info=True)
+        logger.error("获取元素文本失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"获取元素文本失败: {str(e)}"
@@ -385,36 +549,25 @@ def get_element_attribute(
     Args:
         selector: 选择器字符串
         attribute: 属性名
-        selector_type: 选择器类型，支持 'css', 'xpath'，默认 'css'
+        selector_type: 选择器类型，支持 'css', 'xpath', 'text'，默认 'css'
         timeout: 等待元素出现的超时时间（秒），默认 10
     
     Returns:
         Dict[str, Any]: 包含属性值的结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 查找元素
-        if selector_type == "css":
-            element = tab.ele(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            element = tab.ele(f"xpath:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
+        element = tab.ele(locator, timeout=timeout)
         
         if not element:
             return {
@@ -431,7 +584,7 @@ def get_element_attribute(
         }
         
     except Exception as e:
-        logger.error(f"获取元素属性失败: {str(e)}", exc_info=True)
+        logger.error("获取元素属性失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"获取元素属性失败: {str(e)}"
@@ -448,7 +601,7 @@ def wait_for_element(
     
     Args:
         selector: 选择器字符串
-        selector_type: 选择器类型，支持 'css', 'xpath'，默认 'css'
+        selector_type: 选择器类型，支持 'css', 'xpath', 'text'，默认 'css'
         timeout: 超时时间（秒），默认 30
         visible: 是否要求元素可见，默认 True
     
@@ -456,34 +609,23 @@ def wait_for_element(
         Dict[str, Any]: 操作结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 查找元素
         start_time = time.time()
-        if selector_type == "css":
-            element = tab.ele(selector, timeout=timeout)
-        elif selector_type == "xpath":
-            element = tab.ele(f"xpath:{selector}", timeout=timeout)
-        else:
+        locator = _fmt(selector_type, selector)
+        if locator is None:
             return {
                 "success": False,
                 "error": f"不支持的选择器类型: {selector_type}"
             }
+        info = _wait_element(tab, selector_type, selector, locator, timeout)
         
         elapsed = time.time() - start_time
         
-        if not element:
+        if info is None:
             return {
                 "success": False,
                 "error": f"等待超时，未找到元素: {selector}",
@@ -499,20 +641,54 @@ def wait_for_element(
             "success": True,
             "message": f"元素已出现: {selector}",
             "elapsed": elapsed,
-            "element": {
-                "tag": element.tag,
-                "text": element.text
-            }
+            "element": info
         }
         
     except Exception as e:
-        logger.error(f"等待元素失败: {str(e)}", exc_info=True)
+        logger.error("等待元素失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"等待元素失败: {str(e)}"
         }
 
 
+def _wait_element(
+    tab,
+    selector_type: str,
+    selector: str,
+    locator: str,
+    timeout: float
+) -> Optional[Dict[str, Any]]:
+    """等待元素出现并返回其标签和文本
+    
+    CSS 和 XPath 选择器在页面内由 MutationObserver 等待，只需一次 CDP 往返；
+    DrissionPage 专有语法、文本选择器或页面脚本执行失败时退回 DrissionPage 的轮询查找。
+    
+    Returns:
+        Optional[Dict[str, Any]]: 元素的 tag 和 text，超时未出现时返回 None
+    """
+    start_time = time.time()
+    # 以 css 类型传入的 DrissionPage 专有语法由 _fmt 原样返回，无法交给 querySelector
+    if selector_type != "text" and locator == _SELECTOR_PREFIX[selector_type] + selector:
+        try:
+            return tab.run_js(
+                _WAIT_ELEMENT_JS, selector_type, selector, int(timeout * 1000),
+                timeout=timeout + 5
+            )
+        except Exception as e:
+            # 等待期间页面跳转会销毁脚本上下文，剩余时间交给 DrissionPage 轮询
+            logger.debug("页面内等待元素失败，改用轮询: %s", e)
+    
+    remaining = max(timeout - (time.time() - start_time), 0)
+    element = tab.ele(locator, timeout=remaining)
+    if not element:
+        return None
+    return {
+        "tag": element.tag,
+        "text": element.text
+    }
+
+
 def scroll_page(
     direction: str = "down",
     amount: Union[int, str] = "page",
@@ -523,24 +699,15 @@ def scroll_page(
     Args:
         direction: 滚动方向，'up', 'down', 'left', 'right', 'top', 'bottom'
         amount: 滚动量，'page'（一屏）, 'half'（半屏）, 或具体像素数
-        wait_after: 滚动后等待时间（秒），默认 0.5
+        wait_after: 滚动后最长等待时间（秒），页面变化停止后提前返回，默认 0.5
     
     Returns:
         Dict[str, Any]: 操作结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 执行滚动
         if direction == "bottom":
@@ -567,9 +734,9 @@ def scroll_page(
                 "error": f"不支持的滚动方向: {direction}"
             }
         
-        # 等待
+        # 等待页面变化稳定，最长 wait_after 秒
         if wait_after > 0:
-            time.sleep(wait_after)
+            _wait_dom_settled(tab, wait_after)
         
         return {
             "success": True,
@@ -577,7 +744,7 @@ def scroll_page(
         }
         
     except Exception as e:
-        logger.error(f"滚动页面失败: {str(e)}", exc_info=True)
+        logger.error("滚动页面失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"滚动页面失败: {str(e)}"
@@ -595,52 +762,100 @@ def take_screenshot(
         full_page: 是否截取整个页面，默认 False（只截取视口）
     
     Returns:
-        Dict[str, Any]: 操作结果，包含保存路径
+        Dict[str, Any]: 操作结果，包含保存路径；pending 为 True 时文件仍在后台写入，
+            可调用 fsync_pending 等待写入完成
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 生成默认文件名
         if file_path is None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             file_path = f"screenshot_{timestamp}.png"
         
-        # 确保目录存在
-        path_obj = Path(file_path)
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
+        file_path = str(file_path)
+        pic_type = _SCREENSHOT_FORMATS.get(os.path.splitext(file_path)[1].lower())
         
-        # 截图
-        if full_page:
-            tab.get_screenshot(path=str(file_path), full_page=True)
+        if pic_type is None:
+            # 没有图片后缀时 DrissionPage 把路径视为目录并自动命名，同步保存
+            os.makedirs(file_path, exist_ok=True)
+            saved_path = tab.get_screenshot(path=file_path, full_page=full_page)
         else:
-            tab.get_screenshot(path=str(file_path))
+            # 在当前线程截图并打开文件，路径错误直接返回失败；只把写入交给后台线程
+            data = tab.get_screenshot(as_bytes=pic_type, full_page=full_page)
+            f = _open_for_write(file_path, 'wb')
+            _pending_writes[:] = [w for w in _pending_writes if not w.done()]
+            _pending_writes.append(_io_pool.submit(_write_file, f, data))
+            return {
+                "success": True,
+                "message": "截图成功，文件正在后台写入",
+                "file_path": os.path.abspath(file_path),
+                "full_page": full_page,
+                "pending": True
+            }
         
         return {
             "success": True,
             "message": "截图成功",
-            "file_path": str(path_obj.absolute()),
+            "file_path": saved_path,
             "full_page": full_page
         }
         
     except Exception as e:
-        logger.error(f"截图失败: {str(e)}", exc_info=True)
+        logger.error("截图失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"截图失败: {str(e)}"
         }
 
 
+def fsync_pending(timeout: Optional[float] = None) -> List[str]:
+    """等待所有后台截图写入完成
+    
+    Args:
+        timeout: 最长等待时间（秒），None 表示一直等待
+    
+    Returns:
+        List[str]: 写入失败的错误信息，全部成功时为空列表
+    """
+    done, not_done = wait(_pending_writes, timeout=timeout)
+    _pending_writes[:] = list(not_done)
+    errors = [str(f.exception()) for f in done if f.exception() is not None]
+    errors.extend(f"写入超时: {timeout} 秒" for _ in not_done)
+    return errors
+
+
+def _write_file(f: IO, data: bytes) -> None:
+    """在后台线程中写入已打开的截图文件，写完后关闭"""
+    try:
+        with f:
+            f.write(data)
+    except Exception as e:
+        logger.error("写入截图文件失败: %s: %s", f.name, e)
+        raise
+
+
+def _open_for_write(file_path: str, mode: str = 'w', **kwargs) -> IO:
+    """打开文件用于写入，所在目录不存在时自动创建
+    
+    已创建过的目录记录在 _MKDIR_CACHE 中不再检查；目录在此之后被外部删除时
+    打开会失败，此时重新创建目录再打开一次。
+    """
+    parent = os.path.dirname(file_path)
+    if parent and parent not in _MKDIR_CACHE:
+        os.makedirs(parent, exist_ok=True)
+        _MKDIR_CACHE.add(parent)
+    try:
+        return open(file_path, mode, **kwargs)
+    except FileNotFoundError:
+        if not parent:
+            raise
+        os.makedirs(parent, exist_ok=True)
+        return open(file_path, mode, **kwargs)
+
+
 def execute_javascript(
     script: str,
     *args
@@ -655,18 +870,9 @@ def execute_javascript(
         Dict[str, Any]: 执行结果
     """
     try:
-        if not browser_manager.ensure_browser():
-            return {
-                "success": False,
-                "error": "无法初始化浏览器"
-            }
-        
-        tab = browser_manager.get_current_tab()
-        if tab is None:
-            return {
-                "success": False,
-                "error": "没有可用的标签页"
-            }
+        tab, error = _get_tab()
+        if error:
+            return error
         
         # 执行 JavaScript
         result = tab.run_js(script, *args)
@@ -678,9 +884,159 @@ def execute_javascript(
         }
         
     except Exception as e:
-        logger.error(f"执行 JavaScript 失败: {str(e)}", exc_info=True)
+        logger.error("执行 JavaScript 失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"执行 JavaScript 失败: {str(e)}"
         }
 
+
+def batch_actions(
+    actions: List[Dict[str, Any]],
+    timeout: float = 10,
+    stop_on_error: bool = True
+) -> Dict[str, Any]:
+    """按顺序执行多个操作，尽量合并为一次页面脚本调用
+    
+    选择器与单个操作工具一样经 _fmt 转换。连续的 css/xpath/text 定位操作在页面内
+    依次完成，只需一次 CDP 往返：点击使用 element.click()，输入直接设置 value 并
+    触发 input/change 事件，不模拟逐键输入。'@id=x'、'tag:' 等页面脚本无法表达的
+    DrissionPage 定位语法逐个通过 DrissionPage 执行。
+    
+    Args:
+        actions: 操作列表，每项包含 action（'click', 'input', 'get_text'）、
+            selector、可选的 selector_type（默认 'css'），input 操作还需 text
+            及可选的 clear_first（默认 True）
+        timeout: 每个操作等待元素出现的超时时间（秒），默认 10
+        stop_on_error: 某个操作失败时是否停止执行后续操作，默认 True
+    
+    Returns:
+        Dict[str, Any]: 包含每个操作结果的列表
+    """
+    try:
+        # 先在本地校验并转换选择器，避免执行到一半才发现参数错误
+        steps = []
+        for index, item in enumerate(actions):
+            action = item.get("action")
+            if action not in _BATCH_ACTIONS:
+                return {
+                    "success": False,
+                    "error": f"第 {index + 1} 个操作类型不支持: {action}"
+                }
+            selector_type = item.get("selector_type", "css")
+            if selector_type not in _SELECTOR_PREFIX:
+                return {
+                    "success": False,
+                    "error": f"不支持的选择器类型: {selector_type}"
+                }
+            if "selector" not in item:
+                return {
+                    "success": False,
+                    "error": f"第 {index + 1} 个操作缺少 selector"
+                }
+            text = item.get("text")
+            if action == "input" and text is None:
+                return {
+                    "success": False,
+                    "error": f"第 {index + 1} 个操作缺少 text"
+                }
+            # 与 click_element 等工具一样经 _fmt 规范化，页面脚本无法表达的定位语法逐个交给 DrissionPage
+            locator = _fmt(selector_type, item["selector"])
+            text = "" if text is None else str(text)
+            clear_first = item.get("clear_first", True)
+            js_selector = _batch_js_selector(locator)
+            js_step = None
+            if js_selector is not None:
+                js_step = [action, js_selector[1], js_selector[0], text, clear_first]
+            steps.append((js_step, locator, item["selector"], action, text, clear_first))
+        
+        tab, error = _get_tab()
+        if error:
+            return error
+        
+        results = []
+        start = 0
+        while start < len(steps):
+            end = start + 1
+            if steps[start][0] is None:
+                results.append(_run_action(tab, *steps[start][1:], timeout=timeout))
+            else:
+                # 连续的可在页面内执行的操作合并为一次脚本调用；
+                # 脚本总耗时最多为每个操作的等待时间之和，额外留出执行余量
+                while end < len(steps) and steps[end][0] is not None:
+                    end += 1
+                group = steps[start:end]
+                done = json.loads(tab.run_js(
+                    _BATCH_ACTIONS_JS,
+                    {
+                        "actions": [step[0] for step in group],
+                        "waitMs": int(timeout * 1000),
+                        "stopOnError": stop_on_error
+                    },
+                    timeout=timeout * len(group) + 10
+                ) or "[]")
+                for step, result in zip(group, done):
+                    result["selector"] = step[2]
+                results.extend(done)
+            if stop_on_error and not all(r.get("success") for r in results):
+                break
+            start = end
+        
+        succeeded = sum(1 for r in results if r.get("success"))
+        
+        return {
+            "success": succeeded == len(steps),
+            "results": results,
+            "count": len(steps),
+            "succeeded": succeeded,
+            "message": f"已执行 {len(results)}/{len(steps)} 个操作，成功 {succeeded} 个"
+        }
+        
+    except Exception as e:
+        logger.error("批量执行操作失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        return {
+            "success": False,
+            "error": f"批量执行操作失败: {str(e)}"
+        }
+
+
+def _batch_js_selector(locator: str) -> Optional[Tuple[str, str]]:
+    """将定位字符串转换为 batch_actions 页面脚本使用的 (选择器类型, 选择器)
+    
+    Returns:
+        Optional[Tuple[str, str]]: 无法在页面脚本中表达的定位语法返回 None
+    """
+    for prefix, kind in _BATCH_JS_PREFIXES:
+        if locator.startswith(prefix):
+            return kind, locator[len(prefix):]
+    return None
+
+
+def _run_action(
+    tab,
+    locator: str,
+    selector: str,
+    action: str,
+    text: str,
+    clear_first: bool,
+    timeout: float
+) -> Dict[str, Any]:
+    """通过 DrissionPage 执行 batch_actions 中的单个操作，结果格式与页面脚本一致"""
+    result = {"action": action, "selector": selector, "success": False}
+    try:
+        element = tab.ele(locator, timeout=timeout)
+        if not element:
+            result["error"] = f"未找到元素: {selector}"
+        elif action == "click":
+            element.click()
+            result["success"] = True
+        elif action == "input":
+            element.input(text, clear=clear_first)
+            result["success"] = True
+        else:
+            result["text"] = element.text
+            result["tag"] = element.tag
+            result["success"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    return result
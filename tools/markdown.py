@@ -3,61 +3,200 @@
 将网页内容转换为 Markdown 格式并保存。
 """
 
+import functools
+import importlib.util
 import logging
+import os
 import re
-from typing import Dict, Any, Optional
-from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
-try:
-    import markdownify
-    USE_MARKDOWNIFY = True
-except ImportError:
-    USE_MARKDOWNIFY = False
+# 转换库在首次转换时才导入（见 _md、_h2t、_rust_md），这里只检查是否已安装，
+# 不让服务启动为用不到的库付出导入开销
+USE_MARKDOWNIFY = importlib.util.find_spec("markdownify") is not None
+USE_HTML2TEXT = importlib.util.find_spec("html2text") is not None
+
+# 可选的 Rust 实现（html-to-markdown），安装后 auto 模式优先使用
+USE_RUST_MD = importlib.util.find_spec("html_to_markdown") is not None
 
 try:
-    import html2text
-    USE_HTML2TEXT = True
+    from lxml import etree, html as lxml_html
+    from lxml.cssselect import CSSSelector
+    USE_LXML_CSS = True
 except ImportError:
-    USE_HTML2TEXT = False
-
-from bs4 import BeautifulSoup
+    USE_LXML_CSS = False
 
 try:
     from ..browser import browser_manager
+    from .basic import _open_for_write
 except ImportError:
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from browser import browser_manager
+    from tools.basic import _open_for_write
 
 logger = logging.getLogger(__name__)
 
+# markdownify 的默认选项，调用时传入的选项优先；strong_em_symbol 是单个字符，
+# 加粗时重复两次，输出 **粗体** 和 *斜体*
+_DEFAULT_MD_OPTS = {
+    'heading_style': 'ATX',
+    'bullets': '-',
+    'strong_em_symbol': '*',
+    'strip': ['script', 'style']
+}
+
+# html-to-markdown 的默认选项，标题、列表和强调符号与 _DEFAULT_MD_OPTS 一致
+_RUST_MD_OPTS = {
+    'heading_style': 'atx',
+    'bullets': '-',
+    'strong_em_symbol': '*',
+    'strip_tags': ['script', 'style']
+}
+
+# 连续三个及以上的换行，转换后压缩为一个空行
+_RE_BLANKS = re.compile(r'\n{3,}')
+
+# 统计字数时匹配单个单词（连续的非空白字符）
+_RE_WORD = re.compile(r'\S+')
+
+# 页面 HTML 缓存，{标签页 ID: (文档创建时间, 内容指纹, html)}，只保留最近几个标签页
+_html_cache: "OrderedDict[Any, Tuple[float, str, str]]" = OrderedDict()
+_HTML_CACHE_SIZE = 4
+
+# 一次往返读取页面快照，arguments: [已缓存的文档创建时间, 已缓存的内容指纹, 是否需要 html, 是否需要纯文本]
+# performance.timeOrigin 在每次加载新文档时都不同；内容指纹由 HTML 长度、FNV-1a 哈希和 URL
+# 组成，不在页面中留下任何监听器。文档与缓存一致时不返回 html，省去大段 HTML 的传输
+_SNAPSHOT_JS = """
+const [knownOrigin, knownStamp, needHtml, needText] = arguments;
+const snap = {
+    url: location.href,
+    title: document.title,
+    origin: performance.timeOrigin
+};
+if (needHtml) {
+    const html = document.documentElement.outerHTML;
+    let hash = 2166136261;
+    for (let i = 0; i < html.length; i++) {
+        hash = Math.imul(hash ^ html.charCodeAt(i), 16777619);
+    }
+    snap.stamp = html.length + ':' + (hash >>> 0) + ':' + snap.url;
+    if (snap.origin !== knownOrigin || snap.stamp !== knownStamp) {
+        snap.html = html;
+    }
+}
+if (needText) {
+    snap.text = document.body ? document.body.innerText : '';
+}
+return snap;
+"""
+
+# 清理 HTML 时整体移除的标签
+_STRIP_TAGS = ('script', 'style', 'iframe', 'noscript')
+
+# 清理 HTML 时移除的广告和无用元素
+_AD_SELECTOR = ', '.join((
+    '[class*="ad-"]', '[class*="advertisement"]',
+    '[id*="ad-"]', '[id*="advertisement"]',
+    '.sidebar', '.footer', '.header-ad',
+    '[class*="social-share"]', '[class*="cookie"]'
+))
+
+# 主要内容区域的候选选择器，按优先级排列
+_MAIN_SELECTORS = (
+    'main', 'article', '[role="main"]',
+    '.main-content', '#main-content',
+    '.content', '#content',
+    '.post-content', '.article-content'
+)
+
+# 安装了 cssselect 时直接用 lxml 处理，省去构建 BeautifulSoup 树的开销
+if USE_LXML_CSS:
+    _AD_LXML = CSSSelector(_AD_SELECTOR, translator='html')
+    _MAIN_LXML = tuple(
+        CSSSelector(selector, translator='html') for selector in _MAIN_SELECTORS
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _md():
+    """首次使用时导入 markdownify"""
+    import markdownify
+    return markdownify
+
+
+@functools.lru_cache(maxsize=None)
+def _h2t():
+    """首次使用时导入 html2text"""
+    import html2text
+    return html2text
+
+
+@functools.lru_cache(maxsize=None)
+def _rust_md():
+    """首次使用时导入 html-to-markdown"""
+    import html_to_markdown
+    return html_to_markdown
+
 
-def _clean_html(html: str, remove_ads: bool = True) -> str:
-    """清理 HTML，移除广告和不必要的元素
+@functools.lru_cache(maxsize=None)
+def _bs():
+    """首次使用时导入 BeautifulSoup（仅在未安装 cssselect 时用于清理 HTML）"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup
+
+
+@functools.lru_cache(maxsize=None)
+def _sv_matchers() -> Tuple[Any, Tuple[Any, ...]]:
+    """首次使用时预编译 BeautifulSoup 清理用的 soupsieve 选择器
+    
+    Returns:
+        Tuple[Any, Tuple[Any, ...]]: (合并后的清理选择器, 主要内容候选选择器)；
+            清理规则合并为一个选择器，一次遍历即可找出
+    """
+    import soupsieve as sv
+    clean = sv.compile(', '.join(_STRIP_TAGS + (_AD_SELECTOR,)))
+    return clean, tuple(sv.compile(selector) for selector in _MAIN_SELECTORS)
+
+
+def _get_page_snapshot(
+    tab,
+    need_text: bool = False,
+    need_html: bool = True
+) -> Dict[str, Any]:
+    """一次往返获取页面的 URL、标题、HTML（及纯文本），页面未变化时 HTML 使用缓存
     
     Args:
-        html: 原始 HTML
-        remove_ads: 是否移除广告相关元素
+        tab: 标签页对象
+        need_text: 是否需要 body 的纯文本
+        need_html: 是否需要页面 HTML
     
     Returns:
-        str: 清理后的 HTML
+        Dict[str, Any]: 包含 url、title，以及按需返回的 html、text
     """
-    soup = BeautifulSoup(html, 'lxml')
-    
-    if remove_ads:
-        # 移除常见的广告和无用元素
-        for selector in [
-            'script', 'style', 'iframe', 'noscript',
-            '[class*="ad-"]', '[class*="advertisement"]',
-            '[id*="ad-"]', '[id*="advertisement"]',
-            '.sidebar', '.footer', '.header-ad',
-            '[class*="social-share"]', '[class*="cookie"]'
-        ]:
-            for element in soup.select(selector):
-                element.decompose()
+    cached = _html_cache.get(tab.tab_id)
+    known_origin, known_stamp = (cached[0], cached[1]) if cached else (-1, "")
+    try:
+        snap = tab.run_js(_SNAPSHOT_JS, known_origin, known_stamp, need_html, need_text)
+    except Exception as e:
+        logger.debug("获取页面快照失败，逐项读取: %s", e)
+        snap = {"url": tab.url, "title": tab.title}
+        if need_html:
+            snap["html"] = tab.html
+        if need_text:
+            snap["text"] = tab.ele('tag:body').text
+        return snap
     
-    return str(soup)
+    if need_html:
+        if "html" in snap:
+            _html_cache[tab.tab_id] = (snap["origin"], snap["stamp"], snap["html"])
+            if len(_html_cache) > _HTML_CACHE_SIZE:
+                _html_cache.popitem(last=False)
+        else:
+            snap["html"] = cached[2]
+        _html_cache.move_to_end(tab.tab_id)
+    return snap
 
 
 def _html_to_markdown_markdownify(html: str, **options) -> str:
@@ -70,15 +209,27 @@ def _html_to_markdown_markdownify(html: str, **options) -> str:
     Returns:
         str: Markdown 内容
     """
-    default_options = {
-        'heading_style': 'ATX',
-        'bullets': '-',
-        'strong_em_symbol': '**',
-        'strip': ['script', 'style']
-    }
-    default_options.update(options)
+    return _md().markdownify(html, **{**_DEFAULT_MD_OPTS, **options})
+
+
+def _html_to_markdown_rust(html: str, **options) -> str:
+    """使用 html-to-markdown（Rust 实现）转换 HTML 到 Markdown
+    
+    Args:
+        html: HTML 内容
+        **options: html-to-markdown 的 ConversionOptions 选项
     
-    return markdownify.markdownify(html, **default_options)
+    Returns:
+        str: Markdown 内容
+    """
+    html_to_markdown = _rust_md()
+    result = html_to_markdown.convert(
+        html, html_to_markdown.ConversionOptions(**{**_RUST_MD_OPTS, **options})
+    )
+    # 3.x 返回 ConversionResult，2.x 直接返回字符串
+    if isinstance(result, str):
+        return result
+    return result.content or ""
 
 
 def _html_to_markdown_html2text(html: str, **options) -> str:
@@ -91,7 +242,7 @@ def _html_to_markdown_html2text(html: str, **options) -> str:
     Returns:
         str: Markdown 内容
     """
-    h = html2text.HTML2Text()
+    h = _h2t().HTML2Text()
     
     # 默认配置
     h.ignore_links = options.get('ignore_links', False)
@@ -107,37 +258,125 @@ def _html_to_markdown_html2text(html: str, **options) -> str:
     return h.handle(html)
 
 
-def _extract_main_content(html: str) -> str:
-    """尝试提取页面主要内容
+def _clean_and_extract(
+    html: str,
+    remove_ads: bool = True,
+    extract_main: bool = True
+) -> str:
+    """解析一次 HTML，提取主要内容并移除广告和不必要的元素
     
     Args:
         html: 完整的 HTML
+        remove_ads: 是否移除广告相关元素
+        extract_main: 是否只保留主要内容区域
     
     Returns:
-        str: 主要内容的 HTML
+        str: 处理后的 HTML
     """
-    soup = BeautifulSoup(html, 'lxml')
+    if not (remove_ads or extract_main):
+        return html
+    if USE_LXML_CSS:
+        return _clean_and_extract_lxml(html, remove_ads, extract_main)
+    
+    clean_matcher, main_matchers = _sv_matchers()
+    soup = _bs()(html, 'lxml')
+    root = soup
     
-    # 尝试查找主要内容区域
-    main_selectors = [
-        'main', 'article', '[role="main"]',
-        '.main-content', '#main-content',
-        '.content', '#content',
-        '.post-content', '.article-content'
-    ]
+    if extract_main:
+        # 尝试查找主要内容区域，没找到时退回 body，再退回整个文档
+        for matcher in main_matchers:
+            main = matcher.select_one(soup)
+            if main:
+                root = main
+                break
+        else:
+            body = soup.find('body')
+            if body is not None:
+                root = body
+    
+    if remove_ads:
+        # 主要内容区域本身命中清理规则时整体移除
+        if root is not soup and clean_matcher.match(root):
+            return ''
+        # 移除常见的广告和无用元素；结果按文档顺序排列，祖先元素移除后跳过其后代
+        for element in clean_matcher.select(root):
+            if not element.decomposed:
+                element.decompose()
+    
+    return str(root)
+
+
+def _clean_and_extract_lxml(html: str, remove_ads: bool, extract_main: bool) -> str:
+    """_clean_and_extract 的 lxml 实现，使用预编译的 CSSSelector"""
+    try:
+        tree = lxml_html.fromstring(html)
+    except (ValueError, etree.ParserError):
+        # 空文档或带编码声明的字符串无法解析，原样返回
+        return html
+    root = tree
     
-    for selector in main_selectors:
-        main = soup.select_one(selector)
-        if main:
-            return str(main)
+    if extract_main:
+        # 尝试查找主要内容区域，没找到时退回 body，再退回整个文档
+        for selector in _MAIN_LXML:
+            found = selector(tree)
+            if found:
+                root = found[0]
+                break
+        else:
+            body = tree if tree.tag == 'body' else tree.find('body')
+            if body is not None:
+                root = body
     
-    # 如果没找到，尝试找 body
-    body = soup.find('body')
-    if body:
-        return str(body)
+    if remove_ads:
+        # 广告元素由预编译的 XPath 查找；结果包含 root 本身，命中时整体移除
+        for element in _AD_LXML(root):
+            if element is root:
+                return ''
+            element.drop_tree()
+        # 脚本、样式等标签在 libxml2 中一次性删除，保留其后的文本
+        etree.strip_elements(root, *_STRIP_TAGS, with_tail=False)
     
-    # 否则返回原始 HTML
-    return html
+    return lxml_html.tostring(root, encoding='unicode', with_tail=False)
+
+
+def _resolve_converter(converter: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """确定实际使用的 Markdown 转换器
+    
+    Args:
+        converter: 'html_to_markdown', 'markdownify', 'html2text' 或 'auto'
+    
+    Returns:
+        Tuple[Optional[str], Optional[Dict[str, Any]]]: (转换器, None)，
+            不支持或未安装时为 (None, 错误结果)
+    """
+    if converter == "auto":
+        if USE_RUST_MD:
+            return "html_to_markdown", None
+        if USE_MARKDOWNIFY:
+            return "markdownify", None
+        if USE_HTML2TEXT:
+            return "html2text", None
+        return None, {
+            "success": False,
+            "error": "未安装 Markdown 转换库，请安装 markdownify 或 html2text"
+        }
+    
+    available = {
+        "html_to_markdown": (USE_RUST_MD, "html-to-markdown 未安装"),
+        "markdownify": (USE_MARKDOWNIFY, "markdownify 未安装"),
+        "html2text": (USE_HTML2TEXT, "html2text 未安装"),
+    }.get(converter)
+    if available is None:
+        return None, {
+            "success": False,
+            "error": f"不支持的转换器: {converter}"
+        }
+    if not available[0]:
+        return None, {
+            "success": False,
+            "error": available[1]
+        }
+    return converter, None
 
 
 def page_to_markdown(
@@ -157,7 +396,8 @@ def page_to_markdown(
         include_images: 是否包含图片，默认 True
         remove_ads: 是否移除广告元素，默认 True
         extract_main: 是否只提取主要内容区域，默认 True
-        converter: 转换器选择，'markdownify', 'html2text', 'auto'，默认 'auto'
+        converter: 转换器选择，'html_to_markdown', 'markdownify', 'html2text', 'auto'，
+            默认 'auto'（依次优先 html_to_markdown、markdownify、html2text）
         add_metadata: 是否添加元数据（标题、URL等），默认 True
     
     Returns:
@@ -177,12 +417,16 @@ def page_to_markdown(
                 "error": "没有可用的标签页"
             }
         
-        # 获取页面信息
-        url = tab.url
-        title = tab.title
+        # 先确定转换器，未安装时无需获取和解析页面
+        converter, error = _resolve_converter(converter)
+        if error:
+            return error
         
-        # 获取 HTML
-        html = tab.html
+        # 一次往返获取页面信息和 HTML
+        snap = _get_page_snapshot(tab)
+        url = snap["url"]
+        title = snap["title"]
+        html = snap["html"]
         
         if not html:
             return {
@@ -190,85 +434,58 @@ def page_to_markdown(
                 "error": "无法获取页面 HTML"
             }
         
-        # 提取主要内容
-        if extract_main:
-            html = _extract_main_content(html)
-        
-        # 清理 HTML
-        if remove_ads:
-            html = _clean_html(html, remove_ads=True)
-        
-        # 选择转换器
-        if converter == "auto":
-            if USE_MARKDOWNIFY:
-                converter = "markdownify"
-            elif USE_HTML2TEXT:
-                converter = "html2text"
-            else:
-                return {
-                    "success": False,
-                    "error": "未安装 Markdown 转换库，请安装 markdownify 或 html2text"
-                }
+        # 提取主要内容并清理 HTML，只解析一次；安装了 cssselect 时全程使用 lxml，
+        # html2text 路径不会构建 BeautifulSoup 树
+        html = _clean_and_extract(html, remove_ads, extract_main)
         
         # 转换为 Markdown
-        if converter == "markdownify":
-            if not USE_MARKDOWNIFY:
-                return {
-                    "success": False,
-                    "error": "markdownify 未安装"
-                }
+        if converter == "html_to_markdown":
+            markdown_content = _html_to_markdown_rust(
+                html,
+                skip_images=not include_images
+            )
+        elif converter == "markdownify":
             markdown_content = _html_to_markdown_markdownify(
                 html,
                 strip=['script', 'style']
             )
-        elif converter == "html2text":
-            if not USE_HTML2TEXT:
-                return {
-                    "success": False,
-                    "error": "html2text 未安装"
-                }
+        else:
             markdown_content = _html_to_markdown_html2text(
                 html,
                 ignore_images=not include_images
             )
-        else:
-            return {
-                "success": False,
-                "error": f"不支持的转换器: {converter}"
-            }
         
         # 清理 Markdown（移除过多的空行）
-        markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        markdown_content = _RE_BLANKS.sub('\n\n', markdown_content)
         
-        # 添加元数据
+        # 元数据单独写在正文之前，不与正文拼接成新的字符串
+        metadata = ""
         if add_metadata:
             metadata = f"""# {title}
 
 **URL**: {url}  
-**转换时间**: {Path(file_path).stem}
+**转换时间**: {os.path.splitext(os.path.basename(file_path))[0]}
 
 ---
 
 """
-            markdown_content = metadata + markdown_content
         
-        # 确保目录存在
-        path_obj = Path(file_path)
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 保存文件
-        with open(path_obj, 'w', encoding='utf-8') as f:
+        # 保存文件，目录不存在时自动创建
+        with _open_for_write(file_path, 'w', encoding='utf-8') as f:
+            f.write(metadata)
             f.write(markdown_content)
         
-        # 统计信息
-        line_count = len(markdown_content.split('\n'))
-        char_count = len(markdown_content)
-        word_count = len(markdown_content.split())
+        # 统计信息（计数时不生成行列表和单词列表），包含元数据部分
+        line_count = metadata.count('\n') + markdown_content.count('\n') + 1
+        char_count = len(metadata) + len(markdown_content)
+        word_count = sum(
+            1 for part in (metadata, markdown_content) for _ in _RE_WORD.finditer(part)
+        )
         
         return {
             "success": True,
             "message": "网页已成功转换为 Markdown",
-            "file_path": str(path_obj.absolute()),
+            "file_path": os.path.abspath(file_path),
             "url": url,
             "title": title,
             "converter": converter,
@@ -280,7 +497,7 @@ def page_to_markdown(
         }
         
     except Exception as e:
-        logger.error(f"转换 Markdown 失败: {str(e)}", exc_info=True)
+        logger.error("转换 Markdown 失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"转换 Markdown 失败: {str(e)}"
@@ -290,7 +507,8 @@ def page_to_markdown(
 def get_page_content(
     format: str = "markdown",
     extract_main: bool = True,
-    remove_ads: bool = True
+    remove_ads: bool = True,
+    converter: str = "auto"
 ) -> Dict[str, Any]:
     """获取当前页面内容（不保存文件）
     
@@ -298,6 +516,8 @@ def get_page_content(
         format: 返回格式，'markdown', 'html', 'text'
         extract_main: 是否只提取主要内容
         remove_ads: 是否移除广告
+        converter: Markdown 转换器，取值同 page_to_markdown，默认 'auto'；需要
+            与安装环境无关的稳定输出时应显式指定
     
     Returns:
         Dict[str, Any]: 包含页面内容的结果
@@ -316,43 +536,49 @@ def get_page_content(
                 "error": "没有可用的标签页"
             }
         
-        url = tab.url
-        title = tab.title
+        if format not in ("text", "html", "markdown"):
+            return {
+                "success": False,
+                "error": f"不支持的格式: {format}"
+            }
+        
+        if format == "markdown":
+            if converter == "auto" and not (USE_RUST_MD or USE_MARKDOWNIFY or USE_HTML2TEXT):
+                # 未安装任何转换库时 Markdown 降级为纯文本
+                format = "text"
+            else:
+                converter, error = _resolve_converter(converter)
+                if error:
+                    return error
+        
+        # 一次往返获取页面信息，以及所需的 HTML 或纯文本
+        snap = _get_page_snapshot(
+            tab,
+            need_text=format == "text",
+            need_html=format != "text"
+        )
+        url = snap["url"]
+        title = snap["title"]
         
         if format == "text":
             # 直接获取纯文本
-            content = tab.text
+            content = snap["text"]
         elif format == "html":
             # 获取 HTML
-            html = tab.html
-            if extract_main:
-                html = _extract_main_content(html)
-            if remove_ads:
-                html = _clean_html(html)
+            html = _clean_and_extract(snap["html"], remove_ads, extract_main)
             content = html
-        elif format == "markdown":
+        else:
             # 转换为 Markdown
-            html = tab.html
-            if extract_main:
-                html = _extract_main_content(html)
-            if remove_ads:
-                html = _clean_html(html)
+            html = _clean_and_extract(snap["html"], remove_ads, extract_main)
             
-            if USE_MARKDOWNIFY:
+            if converter == "html_to_markdown":
+                content = _html_to_markdown_rust(html)
+            elif converter == "markdownify":
                 content = _html_to_markdown_markdownify(html)
-            elif USE_HTML2TEXT:
-                content = _html_to_markdown_html2text(html)
             else:
-                # 降级到纯文本
-                content = tab.text
-                format = "text"
-        else:
-            return {
-                "success": False,
-                "error": f"不支持的格式: {format}"
-            }
+                content = _html_to_markdown_html2text(html)
         
-        return {
+        result = {
             "success": True,
             "url": url,
             "title": title,
@@ -360,9 +586,12 @@ def get_page_content(
             "content": content,
             "length": len(content)
         }
+        if format == "markdown":
+            result["converter"] = converter
+        return result
         
     except Exception as e:
-        logger.error(f"获取页面内容失败: {str(e)}", exc_info=True)
+        logger.error("获取页面内容失败: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return {
             "success": False,
             "error": f"获取页面内容失败: {str(e)}"